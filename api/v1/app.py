@@ -42,6 +42,22 @@ def page_not_found(error):
     return jsonify(data), 404
 
 
+@app.errorhandler(PermissionError)
+def read_only(error):
+    """
+    Handles writes to a read-only storage, e.g. a snapshot replica
+    (HBNB_FILE_MMAP=1).
+
+    Args:
+    error: The error object.
+
+    Returns:
+    A JSON response with the error message and status code 405.
+    """
+    data = {"error": "Read-only storage"}
+    return jsonify(data), 405
+
+
 if __name__ == "__main__":
     app.run(
             host=os.getenv("HBNB_API_HOST", default="0.0.0.0"),
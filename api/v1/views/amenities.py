@@ -4,6 +4,7 @@ Routes for managing Amenity objects and operations.
 '''
 from flask import jsonify, abort, request
 from api.v1.views import app_views, storage
+from api.v1.views.pagination import paginate
 from models.amenity import Amenity
 
 
@@ -13,13 +14,10 @@ def get_all_amenities():
     Retrieve the list of all Amenity objects.
 
     Returns:
-    A JSON response containing all Amenity objects.
+    A JSON response containing all Amenity objects, or one page of them
+    when `limit` is given.
     '''
-    all_amenities = storage.all(Amenity)
-    all_amenities_dict = [
-            amenity.to_dict() for amenity in all_amenities.values()
-    ]
-    return jsonify(all_amenities_dict)
+    return paginate(Amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'],
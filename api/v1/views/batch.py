@@ -0,0 +1,228 @@
+#!/usr/bin/python3
+"""
+Batch endpoints creating, updating or deleting many objects at once.
+
+    POST   /batch/<collection>  a JSON array of objects to create
+    PUT    /batch/<collection>  a JSON array of objects to update, each
+                                with its "id"
+    DELETE /batch/<collection>  a JSON array of ids to delete
+
+The collections are those of the API: states, cities, amenities, users,
+places and reviews. Objects name their parents in the body, e.g. a city
+carries its state_id. The parents of the whole batch are looked up with
+one query per parent class, and the changes are written with a single
+storage save (one transaction, or one file write) instead of one per
+object; new objects go through the bulk insert path of the storage.
+
+Items are validated as the single-object endpoints validate them, and
+the response lists one result per item, in order: its status and the
+object, or its status and the error. Invalid items are skipped; the
+others are still written. Updates that change nothing are not saved.
+"""
+
+from api.v1.views import app_views
+from api.v1.views.places import valid_amenity_ids
+from datetime import datetime
+from flask import abort, jsonify, request
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from os import getenv
+
+# integer - the largest number of items a batch may hold
+batch_max = int(getenv("HBNB_API_BATCH_MAX", 10000))
+
+# fields no update changes, whatever the collection
+frozen = ["id", "created_at", "updated_at", "__class__"]
+
+# for each collection: its class, the fields a new object requires, the
+# class of each parent id, and the fields an update leaves alone
+collections = {
+    "states": (State, ["name"], {}, frozen),
+    "cities": (City, ["state_id", "name"], {"state_id": State},
+               frozen + ["state_id"]),
+    "amenities": (Amenity, ["name"], {}, frozen),
+    "users": (User, ["email", "password"], {},
+              frozen + ["email", "password"]),
+    "places": (Place, ["city_id", "user_id", "name"],
+               {"city_id": City, "user_id": User},
+               frozen + ["user_id", "city_id"]),
+    "reviews": (Review, ["place_id", "user_id", "text"],
+                {"place_id": Place, "user_id": User},
+                frozen + ["user_id", "place_id"])
+}
+
+
+def batch_request(collection):
+    """
+    Read the collection and the items of the current batch request.
+
+    Args:
+        collection (str): The collection named in the URL.
+
+    Returns:
+        tuple: The collection's entry of `collections`, and the list of
+        items. Aborts with 404 for an unknown collection and with 400 if
+        the body is not a JSON array or holds more than batch_max items.
+    """
+    if collection not in collections:
+        abort(404)
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        abort(400, 'Not a JSON array')
+    if len(items) > batch_max:
+        abort(400, 'Too many items')
+    return collections[collection], items
+
+
+def failure(status, error):
+    """returns the result of an item that was not written"""
+    return {"status": status, "error": error}
+
+
+@app_views.route('/batch/<collection>', methods=['POST'],
+                 strict_slashes=False)
+def create_batch(collection):
+    '''
+    Create the objects of a JSON array.
+
+    Args:
+    collection: The collection to create objects in, e.g. reviews.
+
+    Returns:
+    A JSON array holding, for each item, {"status": 201, "object": ...}
+    or {"status": 400 or 404, "error": ...}.
+    '''
+    (cls, required, parents, _), items = batch_request(collection)
+    found = {}
+    for field, parent_cls in parents.items():
+        ids = [item[field] for item in items
+               if isinstance(item, dict) and isinstance(item.get(field), str)]
+        found[field] = storage.get_many(parent_cls, ids)
+
+    results, objs = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append(failure(400, 'Not a JSON'))
+            continue
+        missing = [field for field in required if field not in item]
+        if missing:
+            results.append(failure(400, 'Missing ' + missing[0]))
+            continue
+        if cls is Place and not valid_amenity_ids(item):
+            results.append(failure(400, 'Invalid amenity_ids'))
+            continue
+        if any(not isinstance(item[field], str) or
+               item[field] not in found[field] for field in parents):
+            results.append(failure(404, 'Not found'))
+            continue
+        try:
+            obj = cls(**item)
+        except (AttributeError, TypeError, ValueError) as error:
+            results.append(failure(400, 'Invalid item: {}'.format(error)))
+            continue
+        objs.append(obj)
+        results.append(obj)
+    storage.bulk_new(objs)
+    storage.bulk_save()
+    for obj in objs:
+        obj.mark_clean()
+    return jsonify([{"status": 201, "object": result.to_dict()}
+                    if not isinstance(result, dict) else result
+                    for result in results])
+
+
+@app_views.route('/batch/<collection>', methods=['PUT'],
+                 strict_slashes=False)
+def update_batch(collection):
+    '''
+    Update the objects of a JSON array, found by their "id".
+
+    Args:
+    collection: The collection of the objects, e.g. places.
+
+    Returns:
+    A JSON array holding, for each item, {"status": 200, "object": ...}
+    or {"status": 400 or 404, "error": ...}.
+    '''
+    (cls, _, _, fixed), items = batch_request(collection)
+    found = storage.get_many(cls, [
+        item["id"] for item in items
+        if isinstance(item, dict) and isinstance(item.get("id"), str)])
+
+    # every item is checked before any stored object changes, so that a
+    # batch cut short leaves nothing half updated
+    results, updates, changed = [], [], {}
+    for item in items:
+        if not isinstance(item, dict):
+            results.append(failure(400, 'Not a JSON'))
+            continue
+        if 'id' not in item:
+            results.append(failure(400, 'Missing id'))
+            continue
+        obj = found.get(item['id']) if isinstance(item['id'], str) else None
+        if obj is None:
+            results.append(failure(404, 'Not found'))
+            continue
+        if cls is Place and not valid_amenity_ids(item):
+            results.append(failure(400, 'Invalid amenity_ids'))
+            continue
+        values = {key: value for key, value in item.items()
+                  if key not in fixed}
+        try:
+            # building a throwaway instance raises as setattr would
+            cls(**values)
+        except (AttributeError, TypeError, ValueError) as error:
+            results.append(failure(400, 'Invalid item: {}'.format(error)))
+            continue
+        results.append(obj)
+        updates.append((obj, values))
+
+    for obj, values in updates:
+        for key, value in values.items():
+            setattr(obj, key, value)
+        if obj.changed_fields() and obj.id not in changed:
+            obj.updated_at = datetime.utcnow()
+            storage.new(obj)
+            changed[obj.id] = obj
+    storage.save()
+    for obj in changed.values():
+        obj.mark_clean()
+    return jsonify([{"status": 200, "object": result.to_dict()}
+                    if not isinstance(result, dict) else result
+                    for result in results])
+
+
+@app_views.route('/batch/<collection>', methods=['DELETE'],
+                 strict_slashes=False)
+def delete_batch(collection):
+    '''
+    Delete the objects whose ids a JSON array lists.
+
+    Args:
+    collection: The collection of the objects, e.g. reviews.
+
+    Returns:
+    A JSON array holding, for each id, {"status": 200} or
+    {"status": 400 or 404, "error": ...}.
+    '''
+    (cls, _, _, _), ids = batch_request(collection)
+    found = storage.get_many(cls, [id for id in ids if isinstance(id, str)])
+
+    results = []
+    for id in ids:
+        if not isinstance(id, str):
+            results.append(failure(400, 'Not an id'))
+            continue
+        obj = found.pop(id, None)
+        if obj is None:
+            results.append(failure(404, 'Not found'))
+            continue
+        storage.delete(obj)
+        results.append({"status": 200})
+    storage.save()
+    return jsonify(results)
@@ -14,6 +14,7 @@ The routes are registered with Flask's `app_views` blueprint.
 """
 
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
 from flask import jsonify, abort, request
 from models import storage
 from models.state import State
@@ -30,13 +31,14 @@ def get_cities_by_state(state_id):
 
     Returns:
         Response: A JSON response containing a list of cities
-        in the state, or a 404 error if the state is not found.
+        in the state, or one page of them when `limit` is given,
+        or a 404 error if the state is not found.
     """
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
 
-    return jsonify([city.to_dict() for city in state.cities])
+    return paginate(City, state_id=state.id)
 
 
 @app_views.route("/cities/<city_id>", methods=["GET"])
@@ -4,6 +4,7 @@
 from api.v1.views import app_views
 from flask import jsonify
 from models import storage
+from os import getenv
 
 
 @app_views.route("/status")
@@ -16,13 +17,26 @@ def get_status():
 @app_views.route("/stats")
 def get_stats():
     """Returns statistics about the API service."""
+    counts = storage.counts()
     return jsonify(
         {
-            "amenities": storage.count('Amenity'),
-            "cities": storage.count('City'),
-            "places": storage.count('Place'),
-            "reviews": storage.count('Review'),
-            "states": storage.count('State'),
-            "users": storage.count('User')
+            "amenities": counts['Amenity'],
+            "cities": counts['City'],
+            "places": counts['Place'],
+            "reviews": counts['Review'],
+            "states": counts['State'],
+            "users": counts['User']
         }
     )
+
+
+@app_views.route("/storage_stats")
+def get_storage_stats():
+    """
+    Returns usage statistics of the storage engine: connection pool
+    checkouts and waits in DB mode, file reloads performed and skipped
+    in file mode.
+    """
+    if getenv('HBNB_TYPE_STORAGE') == 'db':
+        return jsonify({"pool": storage.pool_stats()})
+    return jsonify({"reloads": storage.reload_stats()})
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Keyset pagination for the collection endpoints of the API.
+
+Collections are ordered by id. A client asks for a page with the `limit`
+query parameter and for the following page with `after=<last id seen>`.
+When more objects may follow, the response carries a `Link` header with
+the URL of the next page. Without `limit` the whole collection is
+returned, as before, streamed straight out of storage.
+
+`include` names related collections to nest in each object, e.g.
+`GET /states?include=cities,cities.places`. They are eager-loaded with
+one extra query per relationship rather than one query per object.
+"""
+
+from api.v1.views.streaming import stream_json
+from flask import abort, request
+from models import storage
+from urllib.parse import urlencode
+
+# collections each class can nest through `include`, with their class
+relationships = {"State": {"cities": "City"},
+                 "City": {"places": "Place"},
+                 "Place": {"reviews": "Review", "amenities": "Amenity"}}
+
+
+def page_args():
+    """
+    Read the pagination parameters of the current request.
+
+    Returns:
+        tuple: (limit, after), each None when the parameter is absent.
+        Aborts with 400 if limit is not a positive integer.
+    """
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            abort(400, 'Invalid limit')
+        if limit < 1:
+            abort(400, 'Invalid limit')
+    return limit, request.args.get('after')
+
+
+def include_args(cls):
+    """
+    Read the relationship paths to nest from the current request.
+
+    Args:
+        cls (class): The class of the objects being listed.
+
+    Returns:
+        list: The paths given in `include`, comma separated. Aborts with
+        400 if one does not name a collection of the class.
+    """
+    include = [path for path in request.args.get('include', '').split(',')
+               if path]
+    for path in include:
+        owner = cls.__name__
+        for name in path.split('.'):
+            owner = relationships.get(owner, {}).get(name)
+            if owner is None:
+                abort(400, 'Invalid include')
+    return include
+
+
+def next_link(objs, limit):
+    """
+    Build the Link header pointing at the page after objs.
+
+    Args:
+        objs (list): The objects of the current page.
+        limit (int): The page size that was requested.
+
+    Returns:
+        str or None: The header value, or None on the last page.
+    """
+    if limit is None or len(objs) < limit:
+        return None
+    args = request.args.to_dict()
+    args['after'] = objs[-1].id
+    return '<{}?{}>; rel="next"'.format(request.base_url, urlencode(args))
+
+
+def paginate(cls, **filters):
+    """
+    Respond with one page of the objects of a class.
+
+    Args:
+        cls (class): The class of the objects to list.
+        **filters: Attribute values the objects must have, e.g.
+        state_id=<id>.
+
+    Returns:
+        Response: A streamed JSON array of the objects of the page.
+    """
+    limit, after = page_args()
+    include = include_args(cls)
+    if limit is None:
+        objs = storage.iterate(cls, after, include=include, **filters)
+        return stream_json(objs, include=include)
+    objs = storage.page(cls, limit, after, include=include, **filters)
+    return page_response(objs, limit, include=include)
+
+
+def page_response(objs, limit, status=200, include=()):
+    """
+    Respond with a page of objects fetched for the current request.
+
+    Args:
+        objs (list): The objects of the page.
+        limit (int): The page size that was requested, or None.
+        status (int, optional): The HTTP status code of the response.
+        include (list, optional): Relationship paths to nest in each one.
+
+    Returns:
+        Response: A streamed JSON array of the objects, with a Link header
+        to the next page when the page is full.
+    """
+    response = stream_json(objs, status, include)
+    link = next_link(objs, limit)
+    if link is not None:
+        response.headers['Link'] = link
+    return response
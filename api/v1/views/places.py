@@ -4,6 +4,7 @@ Routes for managing Place objects and operations.
 '''
 from flask import jsonify, abort, request
 from api.v1.views import app_views, storage
+from api.v1.views.pagination import page_args, page_response, paginate
 from models.place import Place
 from models.city import City
 from models.user import User
@@ -19,14 +20,14 @@ def get_places_by_city(city_id):
     city_id: The ID of the City object to retrieve places for.
 
     Returns:
-    A JSON response containing all Place objects of the specified City.
+    A JSON response containing all Place objects of the specified City,
+    or one page of them when `limit` is given.
     '''
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
 
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    return paginate(Place, city_id=city.id)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -70,6 +71,21 @@ def delete_place(place_id):
     return jsonify({})
 
 
+def valid_amenity_ids(request_data):
+    """
+    Tell whether the amenity_ids of a request body, if any, is a list of
+    Amenity IDs.
+
+    Args:
+    request_data: The JSON body of the request, a dictionary.
+
+    Returns:
+    True when amenity_ids is absent or a list of strings.
+    """
+    ids = request_data.get('amenity_ids', [])
+    return isinstance(ids, list) and all(isinstance(id, str) for id in ids)
+
+
 @app_views.route('/cities/<city_id>/places', methods=['POST'],
                  strict_slashes=False)
 def create_place(city_id):
@@ -87,12 +103,14 @@ def create_place(city_id):
         abort(404)
 
     request_data = request.get_json(silent=True)
-    if request_data is None:
+    if not isinstance(request_data, dict):
         abort(400, 'Not a JSON')
     if 'user_id' not in request_data:
         abort(400, 'Missing user_id')
     if 'name' not in request_data:
         abort(400, 'Missing name')
+    if not valid_amenity_ids(request_data):
+        abort(400, 'Invalid amenity_ids')
 
     user = storage.get(User, request_data['user_id'])
     if user is None:
@@ -123,8 +141,10 @@ def update_place(place_id):
         abort(404)
 
     request_data = request.get_json(silent=True)
-    if request_data is None:
+    if not isinstance(request_data, dict):
         abort(400, 'Not a JSON')
+    if not valid_amenity_ids(request_data):
+        abort(400, 'Invalid amenity_ids')
 
     for key, value in request_data.items():
         if key not in ['id', 'user_id', 'city_id', 'created_at', 'updated_at']:
@@ -132,3 +152,34 @@ def update_place(place_id):
 
     place.save()
     return jsonify(place.to_dict())
+
+
+@app_views.route('/places_search', methods=['POST'], strict_slashes=False)
+def search_places():
+    '''
+    Retrieve the Place objects matching a search.
+
+    The JSON body may contain the lists "states", "cities" and
+    "amenities" of object IDs. A Place matches when it is in one of the
+    listed cities or in a city of one of the listed states (any Place when
+    both lists are empty) and has every listed Amenity. Results are
+    ordered by ID and paginated with `limit` and `after`.
+
+    Returns:
+    A JSON response containing the matching Place objects, or 400 if the
+    request body is not valid JSON.
+    '''
+    request_data = request.get_json(silent=True)
+    if not isinstance(request_data, dict):
+        abort(400, 'Not a JSON')
+    search = {}
+    for key in ['states', 'cities', 'amenities']:
+        ids = request_data.get(key) or []
+        if not isinstance(ids, list) or \
+                not all(isinstance(id, str) for id in ids):
+            abort(400, 'Invalid {}'.format(key))
+        search[key] = ids
+
+    limit, after = page_args()
+    places = storage.search_places(limit=limit, after=after, **search)
+    return page_response(places, limit)
@@ -19,10 +19,7 @@ def get_amenities_by_place(place_id):
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    if getenv('HBNB_TYPE_STORAGE') == 'db':
-        return jsonify([amenity.to_dict() for amenity in place.amenities])
-
-    return jsonify([amenity.to_dict() for amenity in place.amenity_ids])
+    return jsonify([amenity.to_dict() for amenity in place.amenities])
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -42,8 +39,9 @@ def delete_amenity_by_place(place_id, amenity_id):
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
-    storage.save()
+        place.amenity_ids = [id for id in place.amenity_ids
+                             if id != amenity_id]
+    place.save()
     return jsonify({}), 200
 
 
@@ -63,7 +61,7 @@ def link_amenity_to_place(place_id, amenity_id):
     else:
         if amenity_id in place.amenity_ids:
             return jsonify(amenity.to_dict()), 200
-        place.amenity_ids.append(amenity_id)
-    storage.save()
+        place.amenity_ids = place.amenity_ids + [amenity_id]
+    place.save()
     return jsonify(amenity.to_dict()), 201
 
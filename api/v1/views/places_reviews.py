@@ -4,6 +4,7 @@ Routes for managing Review objects and operations.
 '''
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
 from models import storage
 from models.place import Place
 from models.review import Review
@@ -20,13 +21,13 @@ def get_reviews(place_id):
     place_id: The ID of the Place.
 
     Returns:
-    A JSON response containing all Review objects for the specified Place.
+    A JSON response containing all Review objects for the specified Place,
+    or one page of them when `limit` is given.
     '''
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    return paginate(Review, place_id=place.id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
@@ -4,6 +4,7 @@ Routes for managing State objects and operations.
 '''
 from flask import jsonify, abort, request
 from api.v1.views import app_views, storage
+from api.v1.views.pagination import paginate
 from models.state import State
 
 
@@ -13,11 +14,10 @@ def get_all_states():
     Retrieve all State objects.
 
     Returns:
-    A JSON response containing all State objects.
+    A JSON response containing all State objects, or one page of them
+    when `limit` is given.
     '''
-    all_states = storage.all(State)
-    all_states_dict = [state.to_dict() for state in all_states.values()]
-    return jsonify(all_states_dict)
+    return paginate(State)
 
 
 @app_views.route("/states", methods=["POST"], strict_slashes=False)
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Streams JSON arrays out of the API one object at a time.
+
+Building a list of to_dict() results and handing it to jsonify() holds
+every object, every dictionary and the whole encoded body in memory at
+once. stream_json() instead encodes each object as the response is sent,
+so the memory a request needs stays bounded however large the collection.
+"""
+
+from flask import Response, json, stream_with_context
+
+
+def serialize(obj, include=()):
+    """
+    Convert an object to a dictionary with related objects nested in it.
+
+    Args:
+        obj: The object to convert, having to_dict().
+        include (list, optional): Relationship paths to nest, e.g.
+        ["cities", "cities.places"].
+
+    Returns:
+        dict: obj.to_dict() plus a list of dictionaries for each top-level
+        relationship in include.
+    """
+    obj_dict = obj.to_dict()
+    nested = {}
+    for path in include:
+        name, _, rest = path.partition('.')
+        nested.setdefault(name, [])
+        if rest:
+            nested[name].append(rest)
+    for name, paths in nested.items():
+        obj_dict[name] = [serialize(related, paths)
+                          for related in getattr(obj, name)]
+    return obj_dict
+
+
+def encode_array(objs, include=()):
+    """
+    Encode objects as a JSON array, piece by piece.
+
+    Args:
+        objs (iterable): The objects to encode, each having to_dict().
+        include (list, optional): Relationship paths to nest in each one.
+
+    Yields:
+        str: The opening bracket, each encoded object with its separator,
+        then the closing bracket.
+    """
+    yield '['
+    separator = ''
+    for obj in objs:
+        yield separator + json.dumps(serialize(obj, include))
+        separator = ','
+    yield ']\n'
+
+
+def stream_json(objs, status=200, include=()):
+    """
+    Respond with a JSON array streamed from an iterable of objects.
+
+    Args:
+        objs (iterable): The objects to send, e.g. storage.iterate(...).
+        status (int, optional): The HTTP status code of the response.
+        include (list, optional): Relationship paths to nest in each one.
+
+    Returns:
+        Response: A streamed application/json response. The request
+        context, and with it the storage session, stays open until the
+        last object has been sent.
+    """
+    return Response(stream_with_context(encode_array(objs, include)),
+                    status=status, mimetype='application/json')
@@ -5,6 +5,7 @@ Routes for managing User objects and operations.
 
 from flask import jsonify, abort, request
 from api.v1.views import app_views, storage
+from api.v1.views.pagination import paginate
 from models.user import User
 
 
@@ -14,11 +15,10 @@ def get_all_users():
     Retrieve the list of all User objects.
 
     Returns:
-    A JSON response containing all User objects.
+    A JSON response containing all User objects, or one page of them
+    when `limit` is given.
     """
-    all_users = storage.all(User)
-    all_users_dict = [user.to_dict() for user in all_users.values()]
-    return jsonify(all_users_dict)
+    return paginate(User)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Times creating reviews through the API one POST at a time and in
+batches through POST /api/v1/batch/reviews, against the storage the
+environment selects (HBNB_TYPE_STORAGE).
+
+Usage: PYTHONPATH=. ./benchmarks/batch_api.py [reviews] [batch size]
+"""
+
+from api.v1.app import app
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import sys
+from time import perf_counter
+
+
+def one_by_one(client, place, user, count):
+    """creates count reviews with one request each, timed"""
+    start = perf_counter()
+    for i in range(count):
+        response = client.post(
+            "/api/v1/places/{}/reviews".format(place.id),
+            json={"user_id": user.id, "text": "Review {}".format(i)})
+        assert response.status_code == 201
+    return perf_counter() - start
+
+
+def batched(client, place, user, count, size):
+    """creates count reviews with requests of size reviews, timed"""
+    start = perf_counter()
+    for first in range(0, count, size):
+        items = [{"place_id": place.id, "user_id": user.id,
+                  "text": "Review {}".format(i)}
+                 for i in range(first, min(first + size, count))]
+        response = client.post("/api/v1/batch/reviews", json=items)
+        assert all(result["status"] == 201 for result in response.json)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    state = State(name="Volta")
+    city = City(state_id=state.id, name="Ho")
+    user = User(email="bench@hbnb.io", password="pwd")
+    place = Place(city_id=city.id, user_id=user.id, name="Hut")
+    for obj in (state, city, user, place):
+        storage.new(obj)
+    storage.save()
+    client = app.test_client()
+    for label, seconds in (
+            ("one by one", one_by_one(client, place, user, count)),
+            ("batch of {}".format(size),
+             batched(client, place, user, count, size))):
+        print("{:<13} {:>6} reviews {:>7.3f}s {:>8.0f} reviews/s".format(
+            label, count, seconds, count / seconds))
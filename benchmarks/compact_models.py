@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""
+Compares the memory FileStorage holds for loaded places and reviews in
+the regular layout and in the compact, slotted layout (HBNB_FILE_COMPACT).
+
+Usage: PYTHONPATH=. ./benchmarks/compact_models.py [count]
+"""
+
+from models.engine.file_storage import classes, compacts
+from models.place import Place
+from models.review import Review
+import sys
+import tracemalloc
+
+
+def records(count):
+    """returns count place and count review dictionaries as saved"""
+    place = Place(city_id="c", user_id="u", name="Labadi", number_rooms=2,
+                  price_by_night=80, latitude=5.56, longitude=-0.14)
+    review = Review(place_id=place.id, user_id="u", text="Great stay")
+    return [dict(obj.to_dict(), id="{}-{:08d}".format(obj.id[:27], i))
+            for i in range(count) for obj in (place, review)]
+
+
+def measure(layout, dicts):
+    """returns the bytes allocated to build every record from layout"""
+    tracemalloc.start()
+    objs = [layout[d["__class__"]](**d) for d in dicts]
+    for obj in objs:
+        obj.mark_clean()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert [obj.to_dict() for obj in objs] == dicts
+    return size
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    dicts = records(count)
+    regular = measure(classes, dicts)
+    compact = measure(compacts, dicts)
+    for label, size in [("regular", regular), ("compact", compact)]:
+        print("{:<8} {:>8.1f} MiB {:>6.0f} bytes/object".format(
+            label, size / 2 ** 20, size / len(dicts)))
+    print("compact saves {:.0%}".format(1 - compact / regular))
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Compares counting rows by loading them with DBStorage.all() against
+DBStorage.count() and DBStorage.counts().
+
+Usage: HBNB_TYPE_STORAGE=db HBNB_MYSQL_USER=... HBNB_MYSQL_PWD=... \\
+       HBNB_MYSQL_HOST=... HBNB_MYSQL_DB=... PYTHONPATH=. \\
+       ./benchmarks/db_count.py [rows]
+
+The amenities table is topped up to `rows` rows (1,000,000 by default)
+before timing.
+"""
+
+from datetime import datetime
+import models
+from models.amenity import Amenity
+import sys
+from time import perf_counter
+import uuid
+
+
+def fill(rows):
+    """inserts Amenity rows until the table holds at least rows rows"""
+    missing = rows - models.storage.count(Amenity)
+    table = Amenity.__table__
+    session = models.storage._DBStorage__session
+    now = datetime.utcnow()
+    while missing > 0:
+        chunk = min(missing, 10000)
+        session.execute(table.insert(), [
+            {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now,
+             "name": "bench"} for _ in range(chunk)])
+        session.commit()
+        missing -= chunk
+
+
+def timed(label, function):
+    """prints how long function took to run"""
+    start = perf_counter()
+    result = function()
+    elapsed = perf_counter() - start
+    print("{:<36} {:>10.3f}s  -> {}".format(label, elapsed, result))
+
+
+if __name__ == "__main__":
+    if models.storage_t != "db":
+        sys.exit("set HBNB_TYPE_STORAGE=db")
+    fill(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
+    storage = models.storage
+    timed("len(storage.all(Amenity))",
+          lambda: len(storage.all(Amenity)))
+    storage.close()
+    timed("storage.count(Amenity)", lambda: storage.count(Amenity))
+    timed("6 x storage.count(name)",
+          lambda: [storage.count(name) for name in
+                   ("Amenity", "City", "Place", "Review", "State", "User")])
+    timed("storage.counts()", lambda: storage.counts())
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Times bursts of concurrent saves, like API requests updating places at
+the same time, with synchronous saves and in group-commit mode
+(HBNB_FILE_GROUP_COMMIT), with and without waiting for durability.
+
+Usage: PYTHONPATH=. ./benchmarks/group_commit.py [objects] [writers]
+"""
+
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+import sys
+import threading
+from time import perf_counter
+
+MODES = [("sync", False, False), ("group", True, False),
+         ("group+wait", True, True)]
+
+
+def burst(places, writers):
+    """has writers threads save every place of places once, timed"""
+    def work(chunk):
+        """saves a share of the places, each on its own"""
+        for place in chunk:
+            place.number_rooms += 1
+            place.save()
+
+    threads = [threading.Thread(target=work, args=(places[i::writers],))
+               for i in range(writers)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    storage.flush()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    for i in range(count):
+        storage.new(Place(city_id="c", user_id="u", name="Place {}".format(i)))
+    storage.save()
+    places = list(storage.all(Place).values())[:200]
+    for label, group_commit, wait in MODES:
+        FileStorage._FileStorage__group_commit = group_commit
+        FileStorage._FileStorage__commit_wait = wait
+        seconds = burst(places, writers)
+        print("{:<11} {:>4} saves {:>7.3f}s {:>8.0f} saves/s".format(
+            label, len(places), seconds, len(places) / seconds))
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Times saving and loading a FileStorage file of places and reviews with
+each serializer (HBNB_FILE_FORMAT), and reports the size of the file.
+
+Usage: PYTHONPATH=. ./benchmarks/serializers.py [count]
+"""
+
+from models.engine.serializers import serializers
+from models.place import Place
+from models.review import Review
+import os
+import sys
+import tempfile
+from timeit import timeit
+
+
+def records(count):
+    """returns count places and count reviews as FileStorage saves them"""
+    objects = {}
+    for i in range(count):
+        place = Place(city_id="c", user_id="u", name="Labadi",
+                      number_rooms=2, price_by_night=80, latitude=5.56,
+                      longitude=-0.14, amenity_ids=["a", "b"])
+        review = Review(place_id=place.id, user_id="u", text="Great stay")
+        for obj in (place, review):
+            objects[obj.__class__.__name__ + "." + obj.id] = obj.to_dict()
+    return objects
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    objects = records(count)
+    print("{:<8} {:>8} {:>8} {:>10}".format("format", "save", "load",
+                                            "size"))
+    for name, serializer in serializers.items():
+        path = os.path.join(tempfile.mkdtemp(), "file" + serializer.extension)
+
+        def save():
+            """writes the file like FileStorage.compact()"""
+            with open(path, 'wb') as f:
+                f.write(serializer.dumps(objects))
+
+        def load():
+            """reads the file like FileStorage.reload()"""
+            with open(path, 'rb') as f:
+                return serializer.loads(f.read())
+
+        save_time = timeit(save, number=1)
+        load_time = timeit(load, number=1)
+        assert load() == objects
+        print("{:<8} {:>7.3f}s {:>7.3f}s {:>8.1f}MB".format(
+            name, save_time, load_time, os.path.getsize(path) / 1e6))
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""
+Checks that parse_time()/format_time() round-trip timestamps to exactly
+the strings strptime()/strftime() produce, and times both codecs.
+
+Usage: PYTHONPATH=. ./benchmarks/timestamps.py [count]
+"""
+
+from datetime import datetime, timedelta
+from models.base_model import format_time, parse_time, time
+import random
+import sys
+from timeit import timeit
+
+
+def sample(count):
+    """returns count timestamps as to_dict() writes them"""
+    start = datetime(2000, 1, 1)
+    stamps = [start + timedelta(microseconds=random.randrange(10 ** 15))
+              for _ in range(count)]
+    # whole seconds are where isoformat() would drop the fraction
+    stamps += [stamp.replace(microsecond=0) for stamp in stamps[:count // 10]]
+    return [stamp.strftime(time) for stamp in stamps]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    strings = sample(count)
+    for string in strings:
+        parsed = parse_time(string)
+        assert parsed == datetime.strptime(string, time), string
+        assert format_time(parsed) == string, string
+    print("{} timestamps round-trip byte-identical".format(len(strings)))
+
+    for label, function in [
+            ("strptime", lambda: [datetime.strptime(s, time)
+                                  for s in strings]),
+            ("parse_time", lambda: [parse_time(s) for s in strings])]:
+        print("{:<12} {:.3f}s".format(label, timeit(function, number=1)))
+    stamps = [parse_time(s) for s in strings]
+    for label, function in [
+            ("strftime", lambda: [d.strftime(time) for d in stamps]),
+            ("format_time", lambda: [format_time(d) for d in stamps])]:
+        print("{:<12} {:.3f}s".format(label, timeit(function, number=1)))
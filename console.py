@@ -7,14 +7,19 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.serializers import by_extension, PickleSerializer
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 import shlex  # for splitting the line along spaces except in double quotes
+from sqlalchemy.exc import SQLAlchemyError
+import struct
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# integer - objects import creates per bulk save
+import_chunk = 10000
 
 
 class HBNBCommand(cmd.Cmd):
@@ -69,6 +74,56 @@ class HBNBCommand(cmd.Cmd):
         print(instance.id)
         instance.save()
 
+    def do_import(self, arg):
+        """Creates the objects of a FileStorage file (json, ndjson or
+        snapshot), reading it record by record and saving in bulk; stops
+        at the first invalid record or failed save, the chunks before it
+        being saved. BaseModel records are skipped in db mode"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** file name missing **")
+            return False
+        # unpickling runs the code a file names: pickles are not imported
+        if args[0].endswith(PickleSerializer.extension):
+            print("** pickle files can't be imported **")
+            return False
+        try:
+            f = open(args[0], 'rb')
+        except OSError:
+            print("** file doesn't exist **")
+            return False
+        count = 0
+        objs = []
+        with f:
+            try:
+                for key, record in by_extension(args[0]).load(f):
+                    cls = classes.get(record.get("__class__"))
+                    if cls is None:
+                        print("** class doesn't exist **")
+                        return False
+                    # the database has no table for BaseModel
+                    if models.storage_t == "db" and cls is BaseModel:
+                        continue
+                    objs.append(cls(**record))
+                    if len(objs) == import_chunk:
+                        count += self._bulk_create(objs)
+                        objs = []
+                count += self._bulk_create(objs)
+            except (AttributeError, KeyError, TypeError, ValueError,
+                    struct.error):
+                print("** invalid file **")
+                return False
+            except (OSError, SQLAlchemyError):
+                print("** objects can't be saved **")
+                return False
+        print(count)
+
+    def _bulk_create(self, objs):
+        """saves objs with a single bulk insert, returns their number"""
+        models.storage.bulk_new(objs)
+        models.storage.bulk_save()
+        return len(objs)
+
     def do_show(self, arg):
         """Prints an instance as a string based on the class and id"""
         args = shlex.split(arg)
@@ -96,7 +151,7 @@ class HBNBCommand(cmd.Cmd):
             if len(args) > 1:
                 key = args[0] + "." + args[1]
                 if key in models.storage.all():
-                    models.storage.all().pop(key)
+                    models.storage.delete(models.storage.all()[key])
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -11,6 +11,9 @@ storage_t = getenv("HBNB_TYPE_STORAGE")
 if storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
+elif getenv("HBNB_FILE_MMAP") == "1":
+    from models.engine.snapshot_storage import SnapshotStorage
+    storage = SnapshotStorage()
 else:
     from models.engine.file_storage import FileStorage
     storage = FileStorage()
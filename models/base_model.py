@@ -10,9 +10,52 @@ import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
+from weakref import WeakKeyDictionary
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+def parse_time(value):
+    """
+    parses a timestamp in the time format; fromisoformat() reads it much
+    faster than strptime(), which stays as the fallback for timestamps
+    whose fraction is not 3 or 6 digits long
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """formats a datetime in the time format, faster than strftime()"""
+    return value.isoformat(timespec="microseconds")
+
+
+# attributes set on each instance since it was loaded or last saved
+changes = WeakKeyDictionary()
+
+# loading strategy per relationship, from e.g.
+# HBNB_RELATIONSHIP_LOADING="State.cities=selectin,Place.amenities=joined"
+relationship_loading = dict(
+    item.strip().split("=", 1)
+    for item in getenv("HBNB_RELATIONSHIP_LOADING", "").split(",")
+    if "=" in item)
+# strategies HBNB_RELATIONSHIP_LOADING may name; the others change the
+# type of the collections or cannot load them
+strategies = ("select", "selectin", "joined", "subquery", "immediate",
+              "noload", "raise")
+for name, strategy in relationship_loading.items():
+    if strategy not in strategies:
+        raise ValueError("HBNB_RELATIONSHIP_LOADING: {} is not one of {}"
+                         .format(strategy, ", ".join(strategies)))
+
+
+def loading(name):
+    """returns the loading strategy configured for relationship name"""
+    return relationship_loading.get(name, "select")
+
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -33,11 +76,11 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -47,27 +90,64 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    def __setattr__(self, name, value):
+        """
+        sets an attribute, records it as changed when its value differs,
+        and refiles foreign keys in storage indexes
+        """
+        unchanged = name in self.__dict__ and self.__dict__[name] == value
+        super().__setattr__(name, value)
+        if not unchanged and not name.startswith("_sa_"):
+            changes.setdefault(self, set()).add(name)
+        if models.storage_t != "db" and name.endswith(("_id", "_ids")):
+            models.storage.reindex(self, name)
+
+    def changed_fields(self):
+        """
+        returns the names of the attributes set since the instance was
+        loaded or last saved; every attribute, id included, for an
+        instance that was never saved
+        """
+        fields = set(changes.get(self, ()))
+        state = getattr(self, "_sa_instance_state", None)
+        if state is not None and state.modified:
+            fields.update(name for name in state.committed_state
+                          if state.attrs[name].history.has_changes())
+        return fields
+
+    def mark_clean(self):
+        """forgets the changes recorded since the last load or save"""
+        changes.pop(self, None)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
                                          self.__dict__)
 
     def save(self):
-        """updates the attribute 'updated_at' with the current datetime"""
+        """
+        updates the attribute 'updated_at' with the current datetime and
+        saves the instance, unless nothing changed since the last save
+        """
+        if not self.changed_fields():
+            return
         self.updated_at = datetime.utcnow()
         models.storage.new(self)
         models.storage.save()
+        self.mark_clean()
 
     def to_dict(self):
         """returns a dictionary containing all keys/values of the instance"""
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
+            state = new_dict.pop("_sa_instance_state")
+            for name in state.mapper.relationships.keys():
+                new_dict.pop(name, None)
 
         if "password" in new_dict and models.storage_t == "db":
             del new_dict["password"]
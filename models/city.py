@@ -1,7 +1,7 @@
 #!/usr/bin/python
 """ holds class City"""
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, loading
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, ForeignKey
@@ -14,7 +14,8 @@ class City(BaseModel, Base):
         __tablename__ = 'cities'
         state_id = Column(String(60), ForeignKey('states.id'), nullable=False)
         name = Column(String(128), nullable=False)
-        places = relationship("Place", backref="cities")
+        places = relationship("Place", backref="cities",
+                              lazy=loading("City.places"))
     else:
         state_id = ""
         name = ""
@@ -22,3 +23,10 @@ class City(BaseModel, Base):
     def __init__(self, *args, **kwargs):
         """initializes city"""
         super().__init__(*args, **kwargs)
+
+    if models.storage_t != "db":
+        @property
+        def places(self):
+            """getter for list of place instances located in the city"""
+            from models.place import Place
+            return models.storage.lookup(Place, "city_id", self.id)
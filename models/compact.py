@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Compact variants of the models, used by FileStorage for the objects it
+loads when HBNB_FILE_COMPACT=1.
+
+A compact class keeps the attributes of its instances in a fixed set of
+__slots__ instead of a per-instance __dict__: id, created_at, updated_at
+and every attribute the model declares a class-level default for, e.g.
+Place.number_rooms or Review.text. An attribute never set reads as that
+default. Attributes outside the layout still work but are kept in a
+dictionary allocated on first use.
+
+Compact instances carry the class name, relationship properties and
+methods of their model, so storage keys, to_dict() and the API treat
+them like the regular instances. They are not instances of the model
+class itself.
+"""
+
+import models
+from models.base_model import BaseModel, changes, format_time
+from models.user import hash_password
+
+# attributes every model has, without a class-level default
+base_fields = ("id", "created_at", "updated_at")
+
+
+class CompactModel:
+    """Base of the compact classes, which store attributes in slots"""
+    __slots__ = ("_extra", "__weakref__")
+    # the regular class a compact class stands in for
+    model = BaseModel
+
+    __init__ = BaseModel.__init__
+    changed_fields = BaseModel.changed_fields
+    mark_clean = BaseModel.mark_clean
+    save = BaseModel.save
+    delete = BaseModel.delete
+
+    def __getattr__(self, name):
+        """reads an unset slot as its default, else an extra attribute"""
+        if name == "_extra":
+            return None
+        if name in self.__slots__:
+            return getattr(self.model, name)
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+        """
+        sets an attribute, records it as changed when its value differs,
+        and refiles foreign keys in storage indexes
+        """
+        if name in self.__slots__:
+            try:
+                current = object.__getattribute__(self, name)
+                unchanged = current == value
+            except AttributeError:
+                unchanged = False
+            object.__setattr__(self, name, value)
+        else:
+            extra = self._extra
+            if extra is None:
+                extra = {}
+                object.__setattr__(self, "_extra", extra)
+            unchanged = name in extra and extra[name] == value
+            extra[name] = value
+        if not unchanged:
+            changes.setdefault(self, set()).add(name)
+        if name.endswith(("_id", "_ids")):
+            models.storage.reindex(self, name)
+
+    def _attrs(self):
+        """returns the attributes set on the instance, like __dict__"""
+        attrs = {}
+        for name in self.__slots__:
+            try:
+                attrs[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        extra = self._extra
+        if extra:
+            attrs.update(extra)
+        return attrs
+
+    def __str__(self):
+        """String representation of the compact instance"""
+        return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
+                                         self._attrs())
+
+    def to_dict(self):
+        """returns a dictionary containing all keys/values of the instance"""
+        new_dict = self._attrs()
+        if "created_at" in new_dict:
+            new_dict["created_at"] = format_time(new_dict["created_at"])
+        if "updated_at" in new_dict:
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
+        new_dict["__class__"] = self.__class__.__name__
+        return new_dict
+
+
+def fields(cls):
+    """returns the attribute layout of cls: base fields, then defaults"""
+    layout = list(base_fields)
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if not name.startswith("_") and name not in layout and \
+                    not callable(value) and not isinstance(value, property):
+                layout.append(name)
+    return tuple(layout)
+
+
+def compact(cls, **namespace):
+    """
+    Build the compact class of a model.
+
+    Args:
+        cls (class): The model, e.g. Place.
+        **namespace: Methods overriding those of CompactModel.
+
+    Returns:
+        class: A CompactModel subclass named like cls, with one slot per
+        attribute of fields(cls) and the properties of cls.
+    """
+    for klass in cls.__mro__:
+        for name, value in vars(klass).items():
+            if isinstance(value, property):
+                namespace.setdefault(name, value)
+    namespace.update({"__slots__": fields(cls), "__doc__": cls.__doc__,
+                      "__module__": __name__, "model": cls})
+    return type(cls.__name__, (CompactModel,), namespace)
+
+
+def _set_user_attr(self, name, value):
+    """sets an attribute of a compact User, hashing the password"""
+    if name == "password":
+        value = hash_password(value)
+    CompactModel.__setattr__(self, name, value)
+
+
+def compact_classes(classes):
+    """returns the compact class of each model in classes, by name"""
+    compacts = {name: compact(cls) for name, cls in classes.items()}
+    if "User" in classes:
+        compacts["User"] = compact(classes["User"],
+                                   __setattr__=_set_user_attr)
+    return compacts
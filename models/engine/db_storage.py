@@ -13,17 +13,41 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import create_engine, event, func, insert, or_, select
+from sqlalchemy.orm import defaultload, scoped_session, selectinload
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from time import perf_counter
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection"""
+    # dictionary - checkout waits, kept on the class to survive recreate()
+    wait = {"count": 0, "total": 0.0, "max": 0.0}
+
+    def _do_get(self):
+        """checks out a connection, timing the wait"""
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = perf_counter() - start
+            self.wait["count"] += 1
+            self.wait["total"] += elapsed
+            self.wait["max"] = max(self.wait["max"], elapsed)
+
+
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # dictionary - connection pool events counted since start up
+    __pool_events = None
+    # integer - rows per multi-row INSERT statement of bulk_save()
+    __bulk_chunk = int(getenv('HBNB_MYSQL_BULK_CHUNK', 1000))
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,11 +56,24 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
+        pool_options = {
+            "poolclass": TimedQueuePool,
+            "pool_size": int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+            "max_overflow": int(getenv('HBNB_MYSQL_MAX_OVERFLOW', 10)),
+            "pool_timeout": float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)),
+            "pool_recycle": int(getenv('HBNB_MYSQL_POOL_RECYCLE', 3600)),
+            "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING', '1') == '1'
+        }
         self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
                                       format(HBNB_MYSQL_USER,
                                              HBNB_MYSQL_PWD,
                                              HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+                                             HBNB_MYSQL_DB),
+                                      **pool_options)
+        self.__pool_events = {"connect": 0, "checkout": 0, "checkin": 0,
+                              "invalidate": 0}
+        for name in self.__pool_events:
+            event.listen(self.__engine, name, self._count_pool_event(name))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
@@ -44,7 +81,7 @@ class DBStorage:
         """query on the current database session"""
         new_dict = {}
         for clss in classes:
-            if cls is None or cls is classes[clss] or cls is clss:
+            if cls is None or cls is classes[clss] or cls == clss:
                 objs = self.__session.query(classes[clss]).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
@@ -59,6 +96,66 @@ class DBStorage:
         """commit all changes of the current database session"""
         self.__session.commit()
 
+    def bulk_new(self, objs):
+        """
+        Queue new objects for bulk_save(), outside of the session.
+
+        The queue is kept in the info of the current session, so each
+        thread, like the session, has its own, and close() drops it.
+
+        Args:
+            objs (iterable): The new objects, e.g. Review instances.
+            Objects of a class without a table, such as BaseModel, raise
+            TypeError before any is queued.
+        """
+        objs = list(objs)
+        for obj in objs:
+            if getattr(obj, "__table__", None) is None:
+                raise TypeError("{} has no table".format(
+                    obj.__class__.__name__))
+        self.__session().info.setdefault("bulk", []).extend(objs)
+
+    def bulk_save(self):
+        """
+        Insert the objects the current thread queued with bulk_new(),
+        with multi-row INSERT statements of __bulk_chunk rows, parents
+        before children, and commit them with the changes of the session
+        in one transaction.
+
+        The rows skip the ORM unit of work: the objects keep the id and
+        timestamps BaseModel gave them but are not added to the session,
+        and only their columns are written, not their many-to-many links
+        such as Place.amenities.
+        """
+        rows = {}
+        for obj in self.__session().info.pop("bulk", []):
+            rows.setdefault(obj.__table__, []).append(self._row(obj))
+        chunk = self.__bulk_chunk
+        try:
+            for table in Base.metadata.sorted_tables:
+                table_rows = rows.get(table, [])
+                for start in range(0, len(table_rows), chunk):
+                    self.__session.execute(
+                        insert(table).values(table_rows[start:start + chunk]))
+            self.__session.commit()
+        except Exception:
+            self.__session.rollback()
+            raise
+
+    @staticmethod
+    def _row(obj):
+        """returns the column values of obj, as bulk_save() inserts them"""
+        row = {}
+        for prop in sqlalchemy.inspect(type(obj)).column_attrs:
+            column = prop.columns[0]
+            if prop.key in obj.__dict__:
+                row[column.key] = obj.__dict__[prop.key]
+            elif column.default is not None and column.default.is_scalar:
+                row[column.key] = column.default.arg
+            else:
+                row[column.key] = None
+        return row
+
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
@@ -69,30 +166,227 @@ class DBStorage:
         Retrieve an instance of a specified class by its ID.
 
         Args:
-            cls (str, optional): The name of the class type of the
-            instance to be retrieved. Defaults to None.
+            cls (class or str, optional): The class, or the name of the
+            class type, of the instance to be retrieved. Defaults to None.
             id (str, optional): The ID of the instance to retrieve.
 
         Returns:
             object or None: The instance of the specified class with the
-            given ID if found, otherwise None.
+            given ID if found, otherwise None. An instance already loaded
+            in the session is returned without querying the database.
         """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
         if cls and id:
-            return self.__session.query(cls).filter(cls.id == id).first()
+            return self.__session.get(cls, id)
         return None
 
+    def get_many(self, cls, ids):
+        """
+        Retrieve the instances of a class with any of the given IDs in a
+        single query.
+
+        Args:
+            cls (class or str): The class, or the name of the class type,
+            of the instances to be retrieved.
+            ids (list): The IDs of the instances to retrieve.
+
+        Returns:
+            dict: The instances found, keyed by ID. IDs matching no
+            instance are left out.
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        ids = set(ids)
+        if cls is None or not ids:
+            return {}
+        objs = self.__session.query(cls).filter(cls.id.in_(ids)).all()
+        return {obj.id: obj for obj in objs}
+
+    def page(self, cls, limit=None, after=None, include=(), **filters):
+        """
+        Retrieve objects of a class ordered by id, one page at a time.
+
+        Args:
+            cls (class or str): The class, or class name, to list.
+            limit (int, optional): The maximum number of objects to return.
+            after (str, optional): Only return objects whose id sorts after
+            this one, i.e. the id of the last object of the previous page.
+            include (list, optional): Relationship paths to eager-load,
+            e.g. ["cities", "cities.places"].
+            **filters: Column values the objects must have, e.g.
+            state_id=<id>.
+
+        Returns:
+            list: The objects of the page.
+        """
+        query = self._page_query(cls, after, include, **filters)
+        return query.limit(limit).all()
+
+    def iterate(self, cls, after=None, batch=1000, include=(), **filters):
+        """
+        Iterate over the objects of a class ordered by id, fetching them
+        from the database in batches so they never all sit in memory.
+
+        Args:
+            cls (class or str): The class, or class name, to list.
+            after (str, optional): Only yield objects whose id sorts after
+            this one.
+            batch (int, optional): The number of rows fetched at a time.
+            include (list, optional): Relationship paths to eager-load.
+            **filters: Column values the objects must have.
+
+        Returns:
+            iterator: The objects, in id order. Relationships configured
+            to load joined, by subquery or immediately are loaded with
+            selectin here, at any depth of the eager loads and include
+            paths, as yield_per cannot be combined with them.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self._page_query(cls, after, include, **filters)
+        tree = {}
+        for path in include:
+            node = tree
+            for name in path.split("."):
+                node = node.setdefault(name, {})
+        options = self._selectin_options(cls, tree, None, ())
+        return query.options(*options).yield_per(batch)
+
+    def _selectin_options(self, cls, tree, loader, path):
+        """
+        returns the loader options that switch the joined, subquery and
+        immediate relationships loaded along with cls to selectin; tree
+        holds the include paths below cls, loader is the option reaching
+        cls and path the relationships followed to it
+        """
+        options = []
+        for rel in sqlalchemy.inspect(cls).relationships:
+            included = rel.key in tree
+            if rel in path or not (included or rel.lazy in
+                                   ("joined", "subquery", "selectin",
+                                    "immediate")):
+                continue
+            attr = getattr(cls, rel.key)
+            if included or rel.lazy != "selectin":
+                option = (selectinload(attr) if loader is None
+                          else loader.selectinload(attr))
+            else:
+                option = (defaultload(attr) if loader is None
+                          else loader.defaultload(attr))
+            options.append(option)
+            options.extend(self._selectin_options(
+                rel.mapper.class_, tree.get(rel.key, {}), option,
+                path + (rel,)))
+        return options
+
+    def search_places(self, states=(), cities=(), amenities=(),
+                      limit=None, after=None):
+        """
+        Retrieve the places located in any of the given states or cities
+        that have all of the given amenities, ordered by id, in a single
+        query.
+
+        Args:
+            states (list): State ids; their cities are searched.
+            cities (list): City ids searched in addition to the states.
+            amenities (list): Amenity ids every place must have.
+            limit (int, optional): The maximum number of places to return.
+            after (str, optional): Only return places whose id sorts after
+            this one.
+
+        Returns:
+            list: The matching places. Every place matches when states
+            and cities are both empty.
+        """
+        from models.place import place_amenity
+        query = self._page_query(Place, after)
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(states), City.id.in_(cities)))
+        amenities = set(amenities)
+        if amenities:
+            having_all = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenities)).group_by(
+                place_amenity.c.place_id).having(
+                func.count(place_amenity.c.amenity_id) == len(amenities))
+            query = query.filter(Place.id.in_(having_all))
+        return query.limit(limit).all()
+
+    def _page_query(self, cls, after=None, include=(), **filters):
+        """builds the id-ordered query behind page() and iterate()"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__session.query(cls).filter_by(**filters)
+        if after is not None:
+            query = query.filter(cls.id > after)
+        for path in include:
+            option, owner = None, cls
+            for name in path.split("."):
+                attr = getattr(owner, name)
+                if option is None:
+                    option = selectinload(attr)
+                else:
+                    option = option.selectinload(attr)
+                owner = attr.property.mapper.class_
+            query = query.options(option)
+        return query.order_by(cls.id)
+
     def count(self, cls_name=None):
         """
         Count the number of instances of a specified class.
 
         Args:
-            cls_name (str, optional): The name of the class type
-            to count instances of.
+            cls_name (class or str, optional): The class, or the name of
+            the class type, to count instances of. Counts every class
+            when omitted.
 
         Returns:
             int: The number of instances of the specified class.
         """
-        return len(self.all(cls_name))
+        if cls_name is None:
+            return sum(self.counts().values())
+        if isinstance(cls_name, str):
+            cls_name = classes.get(cls_name)
+        if cls_name not in classes.values():
+            return 0
+        return self.__session.query(func.count(cls_name.id)).scalar()
+
+    def counts(self):
+        """
+        Count the instances of every class in a single query.
+
+        Returns:
+            dict: The number of instances keyed by class name.
+        """
+        columns = [select(func.count(cls.id)).scalar_subquery().label(name)
+                   for name, cls in classes.items()]
+        row = self.__session.query(*columns).one()
+        return dict(zip(classes, row))
+
+    def _count_pool_event(self, name):
+        """returns a pool event listener that counts event name"""
+        def listener(*args):
+            """counts one occurrence of the pool event"""
+            self.__pool_events[name] += 1
+        return listener
+
+    def pool_stats(self):
+        """
+        Report how the connection pool is being used.
+
+        Returns:
+            dict: The pool's size, overflow and connections checked in
+            and out now, the pool events counted since start up, and the
+            number, total and longest wait (in seconds) of checkouts.
+        """
+        pool = self.__engine.pool
+        stats = {"size": pool.size(), "checked_in": pool.checkedin(),
+                 "checked_out": pool.checkedout(),
+                 "overflow": pool.overflow(), "timeout": pool.timeout()}
+        stats.update(self.__pool_events)
+        stats["waits"] = dict(TimedQueuePool.wait)
+        return stats
 
     def reload(self):
         """reloads data from the database"""
@@ -3,69 +3,824 @@
 Contains the FileStorage class
 """
 
+import atexit
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
 import json
+import os
+from os import getenv
+import threading
+from time import monotonic
+from types import MappingProxyType
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, parse_time
 from models.city import City
+from models.compact import compact_classes
+from models.engine.rwlock import ReadWriteLock
+from models.engine.serializers import serializers
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 
+try:
+    import fcntl
+except ImportError:
+    # advisory file locks, used by shared mode, only exist on Unix
+    fcntl = None
+
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# slotted variants of the classes, built by _load() in compact mode
+compacts = compact_classes(classes)
+# foreign-key attributes that FileStorage keeps a reverse index for; list
+# attributes are indexed under each of their elements
+indexes = {"City": ("state_id",),
+           "Place": ("city_id", "user_id", "amenity_ids"),
+           "Review": ("place_id", "user_id")}
 
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
-    # string - path to the JSON file
-    __file_path = "file.json"
-    # dictionary - empty but will store all objects by <class name>.id
+    # class - serializer the file is written with, see serializers.py
+    __format = serializers[getenv("HBNB_FILE_FORMAT", "json")]
+    # string - path to the JSON file, or pickle file in that format
+    __file_path = "file" + __format.extension
+    # string - path to the append-only journal kept next to the JSON file
+    __log_path = __file_path + ".log"
+    # dictionary - empty but will store all objects by <class name>.id;
+    # in lazy mode, records not yet accessed stay as their raw dictionary
     __objects = {}
+    # dictionary - keys of the records still raw, by class name
+    __raw = {}
+    # boolean - build instances on first access instead of on reload
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
+    # boolean - build loaded instances from the compact classes
+    __compact = getenv("HBNB_FILE_COMPACT") == "1"
+    # dictionary - the same objects bucketed by class name, then by key
+    __buckets = {}
+    # dictionary - sorted ids of each bucket, built on first page() call
+    __sorted_ids = {}
+    # dictionary - objects changed since the last save, None when deleted
+    __dirty = {}
+    # dictionary - objects by (class name, attribute, value), then by key
+    __indexes = {}
+    # dictionary - the __indexes entries each object is filed under
+    __index_entries = {}
+    # boolean - append changes to __log_path instead of rewriting the file
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal size in bytes that triggers a compaction
+    __journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX", 1024 * 1024))
+    # string - when to fsync: "always", after journal appends too,
+    # "snapshot", after rewriting the file only, or "never"
+    __fsync = getenv("HBNB_FILE_FSYNC", "snapshot")
+    # boolean - leave saves to a background writer that batches them
+    __group_commit = getenv("HBNB_FILE_GROUP_COMMIT") == "1"
+    # float - seconds the writer waits for more saves to join a batch
+    __commit_delay = float(getenv("HBNB_FILE_COMMIT_DELAY", 0.05))
+    # integer - number of pending saves that starts a write at once
+    __commit_batch = int(getenv("HBNB_FILE_COMMIT_BATCH", 100))
+    # boolean - save() returns only once its changes are written
+    __commit_wait = getenv("HBNB_FILE_COMMIT_WAIT") == "1"
+    # ReadWriteLock - shared by the methods reading the objects,
+    # exclusive for those changing them
+    __lock = ReadWriteLock()
+    # RLock - serializes the building of raw records by readers
+    __hydrate_lock = threading.RLock()
+    # Lock - serializes the writes of the files, which run without __lock
+    __write_mutex = threading.Lock()
+    # Condition - guards __commits and wakes the writer thread
+    __commit_cond = threading.Condition()
+    # dictionary - last save requested, last save a write covered, last
+    # save a successful write covered, and the error of the last failure
+    __commits = {"requested": 0, "written": 0, "durable": 0, "error": None}
+    # Thread - the background writer, started by the first save
+    __writer = None
+    # boolean - coordinate with other processes using the same file
+    __shared = getenv("HBNB_FILE_SHARED") == "1"
+    # string - lock file of shared mode, which holds the generation
+    # number, incremented by every write of any process
+    __lock_path = __file_path + ".lock"
+    # file - the open lock file while this process holds the file lock
+    __lock_file = None
+    # integer - generation of the file when this process last synced
+    __generation = None
+    # boolean - keep the objects of each class in their own file, named
+    # after the class, e.g. Place.json, next to __file_path
+    __sharded = getenv("HBNB_FILE_SHARDED") == "1"
+    # set - classes whose file is loaded, in sharded mode
+    __loaded = set()
+    # set - classes changed since their file was last written
+    __changed_shards = set()
+    # tuple - (mtime, size, inode) of the files when they were last synced
+    __signature = None
+    # dictionary - how often close() reloaded the file versus skipped it
+    __reload_stats = {"performed": 0, "skipped": 0}
 
+    @__lock.reading
     def all(self, cls=None):
-        """returns the dictionary __objects"""
+        """
+        returns the dictionary __objects, or a read-only copy of the
+        objects of one class (given as a class or a class name); unlike
+        the copy, __objects may change while the caller iterates over it
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            cls_name = self._class_name(cls)
+            self._shard(cls_name)
+            for key in list(self.__raw.get(cls_name, ())):
+                self._hydrate(key)
+            return MappingProxyType(dict(self.__buckets.get(cls_name, {})))
+        for cls_name in classes:
+            self._shard(cls_name)
+        for cls_name in list(self.__raw):
+            for key in list(self.__raw[cls_name]):
+                self._hydrate(key)
         return self.__objects
 
+    @staticmethod
+    def _class_name(cls):
+        """returns the name of cls, which may be a class or a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    @__lock.writing
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            self._shard(obj.__class__.__name__)
+            self._put(key, obj)
+            self.__dirty[key] = obj
+            self.__changed_shards.add(obj.__class__.__name__)
 
-    def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+    @__lock.writing
+    def bulk_new(self, objs):
+        """sets in __objects every object of objs, as new() does"""
+        for obj in objs:
+            self.new(obj)
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    def bulk_save(self):
+        """persists the objects of bulk_new(), with one save()"""
+        self.save()
+
+    def save(self, wait=None):
+        """
+        Persist the objects changed since the last save.
+
+        In journal mode only the changed objects are appended to the
+        journal, which is folded back into the JSON file once it grows
+        past __journal_max bytes. An object that was saved before only has
+        its changed fields appended. Otherwise __objects is serialized to
+        the JSON file (path: __file_path).
+
+        In group-commit mode the write is left to a background thread
+        that batches the saves made within __commit_delay seconds of each
+        other, up to __commit_batch of them, into one write. save() then
+        returns at once, unless wait is true (default: __commit_wait), in
+        which case it returns once its changes are written.
+        """
+        if not self.__group_commit:
+            self._write()
+            return
+        with self.__commit_cond:
+            self.__commits["requested"] += 1
+            ticket = self.__commits["requested"]
+            if self.__writer is None or not self.__writer.is_alive():
+                FileStorage.__writer = threading.Thread(
+                    target=self._write_batches, daemon=True)
+                self.__writer.start()
+            self.__commit_cond.notify_all()
+            if wait is None:
+                wait = self.__commit_wait
+            if wait:
+                self._wait_for(ticket)
+
+    def flush(self):
+        """waits until every save requested so far is written"""
+        with self.__commit_cond:
+            self._wait_for(self.__commits["requested"])
+
+    def _wait_for(self, ticket):
+        """
+        waits, holding __commit_cond, until save number ticket is written,
+        and raises the error of the write if it failed. A failed write
+        leaves its objects dirty, so a later successful write that covers
+        ticket makes it durable after all.
+        """
+        while self.__commits["written"] < ticket:
+            self.__commit_cond.wait()
+        if self.__commits["durable"] < ticket:
+            raise self.__commits["error"]
+
+    def _write_batches(self):
+        """writes the pending saves in batches, for the writer thread"""
+        while True:
+            with self.__commit_cond:
+                while self.__commits["requested"] == \
+                        self.__commits["written"]:
+                    self.__commit_cond.wait()
+                deadline = monotonic() + self.__commit_delay
+                while (self.__commits["requested"] -
+                       self.__commits["written"] < self.__commit_batch):
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__commit_cond.wait(remaining)
+                ticket = self.__commits["requested"]
+            try:
+                self._write()
+                error = None
+            except Exception as e:
+                error = e
+            with self.__commit_cond:
+                if error is None:
+                    self.__commits["durable"] = ticket
+                else:
+                    self.__commits["error"] = error
+                self.__commits["written"] = ticket
+                self.__commit_cond.notify_all()
+
+    def _write(self):
+        """writes the objects changed since the last write"""
+        with self.__write_mutex:
+            self._commit(full=not self.__journal)
+            if self.__journal and os.path.exists(self.__log_path) and \
+                    os.path.getsize(self.__log_path) > self.__journal_max:
+                self._commit(full=True)
+
+    @contextmanager
+    def _file_lock(self, exclusive=False):
+        """
+        In shared mode, holds the advisory lock of __lock_path within a
+        with block: shared to read the file and journal, exclusive to
+        write them, so that no process reads them halfway through a
+        write of another.
+
+        Taking the exclusive lock first merges the writes other processes
+        made since this one last synced, and releasing it increments the
+        generation: each process then only writes its own changes over
+        those of the others. The lock is reentrant; callers hold __lock
+        for writing, and an exclusive lock must be the outermost one.
+        """
+        if not self.__shared or self.__lock_file is not None:
+            yield
+            return
+        with open(self.__lock_path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            FileStorage.__lock_file = f
+            try:
+                if exclusive and self._generation() != self.__generation:
+                    self._sync()
+                yield
+                if exclusive:
+                    generation = self._generation() + 1
+                    f.seek(0)
+                    f.truncate()
+                    f.write(str(generation))
+                    f.flush()
+                    FileStorage.__generation = generation
+            finally:
+                FileStorage.__lock_file = None
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _generation(self):
+        """returns the generation number held in the locked lock file"""
+        self.__lock_file.seek(0)
+        return int(self.__lock_file.read() or 0)
+
+    def _sync(self):
+        """
+        replaces the objects with those on disk, then reapplies the
+        changes of this process that are not written yet
+        """
+        dirty = dict(self.__dirty)
+        for structure in (self.__objects, self.__raw, self.__buckets,
+                          self.__sorted_ids, self.__indexes,
+                          self.__index_entries, self.__changed_shards):
+            structure.clear()
+        self.reload()
+        for key, obj in dirty.items():
+            self._shard(key.split(".", 1)[0])
+            if obj is None:
+                self._pop(key)
+            else:
+                self._put(key, obj)
+            self.__changed_shards.add(key.split(".", 1)[0])
+
+    def _record(self, key, obj):
+        """returns the journal record persisting the change of obj"""
+        if obj is None:
+            return {"op": "delete", "key": key}
+        fields = obj.changed_fields()
+        obj_dict = obj.to_dict()
+        if fields and "id" not in fields:
+            return {"op": "update", "key": key,
+                    "fields": {name: obj_dict[name] for name in fields
+                               if name in obj_dict}}
+        return {"op": "put", "key": key, "obj": obj_dict}
+
+    def compact(self):
+        """
+        writes every object to the JSON file and empties the journal; in
+        sharded mode, only the files of the classes that changed
+        """
+        with self.__write_mutex:
+            self._commit(full=True)
+
+    def _commit(self, full):
+        """
+        Write the changes, to the journal or, when full, to the JSON file.
+
+        The changes are taken holding __lock for writing, then written
+        without it, so that readers, and writers, go on while the file is
+        encoded, written and synced; __write_mutex, held by the callers,
+        keeps the writes in order. In shared mode the write must follow
+        the merge with the other processes, so __lock is held throughout.
+        A write that fails leaves the changes dirty, for the next one.
+        """
+        if self.__shared:
+            with self.__lock.write(), self._file_lock(exclusive=True):
+                changes = self._take_changes(full)
+                self._write_changes(changes)
+            return
+        with self.__lock.write():
+            changes = self._take_changes(full)
+        self._write_changes(changes)
+
+    def _take_changes(self, full):
+        """
+        returns the changes _commit() writes: the dirty objects and
+        changed shards, with the journal records or the copied objects of
+        each file to write; clears them and marks their objects clean
+        """
+        changes = {"dirty": dict(self.__dirty),
+                   "shards": set(self.__changed_shards)}
+        if not full:
+            changes["records"] = [self._record(key, obj)
+                                  for key, obj in self.__dirty.items()]
+        elif self.__sharded:
+            changes["files"] = [
+                (self._shard_path(cls_name),
+                 dict(self.__buckets.get(cls_name, {})))
+                for cls_name in self.__changed_shards]
+        else:
+            changes["files"] = [(self.__file_path, dict(self.__objects))]
+        for obj in self.__dirty.values():
+            if obj is not None:
+                obj.mark_clean()
+        self.__dirty.clear()
+        if full:
+            self.__changed_shards.clear()
+        return changes
+
+    def _write_changes(self, changes):
+        """
+        writes the changes of _take_changes(); if that fails, makes them
+        dirty again, unless changed since, and raises the error
+        """
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            with self._file_lock(exclusive=True):
+                if "records" in changes:
+                    with open(self.__log_path, 'a') as f:
+                        for record in changes["records"]:
+                            f.write(json.dumps(record) + "\n")
+                        if self.__fsync == "always":
+                            f.flush()
+                            os.fsync(f.fileno())
+                else:
+                    for path, objects in changes["files"]:
+                        self._write_atomic(path, self._records(objects))
+                    if os.path.exists(self.__log_path):
+                        os.remove(self.__log_path)
+                FileStorage.__signature = self._file_signature()
+        except Exception:
+            with self.__lock.write():
+                for key, obj in changes["dirty"].items():
+                    self.__dirty.setdefault(key, obj)
+                self.__changed_shards.update(changes["shards"])
+            raise
+
+    @staticmethod
+    def _records(objects):
+        """yields the key and to_dict() dictionary of each of objects"""
+        for key, obj in objects.items():
+            yield key, obj if type(obj) is dict else obj.to_dict()
+
+    def _shard_path(self, cls_name):
+        """returns the path of the file of class cls_name in sharded mode"""
+        return os.path.join(os.path.dirname(self.__file_path),
+                            cls_name + self.__format.extension)
+
+    def _shard(self, cls_name):
+        """
+        In sharded mode, loads the file of class cls_name unless it is
+        loaded already. Readers may call it, so loading takes
+        __hydrate_lock.
+        """
+        if not self.__sharded or cls_name in self.__loaded:
+            return
+        with self.__hydrate_lock, self._file_lock():
+            if cls_name in self.__loaded:
+                return
+            self._read(self._shard_path(cls_name))
+            self.__loaded.add(cls_name)
+
+    def _read(self, path):
+        """
+        stores the records of the file at path, if any, reading them one
+        at a time with serializers that can stream them
+        """
+        try:
+            with open(path, 'rb') as f:
+                for key, record in self.__format.load(f):
+                    self._put(key, record if self.__lazy
+                              else self._load(record))
         except IOError:
             pass
 
+    def _write_atomic(self, path, items):
+        """
+        Replace the file at path with the (key, record) pairs of items in
+        one step.
+
+        They go to a temporary file next to path, which is then renamed
+        over path: a reader opens either the old file or the new one,
+        never a partly written one, and a crash leaves the old file in
+        place. Unless __fsync is "never", the temporary file and then the
+        directory entry of the rename are flushed to disk.
+        """
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp_path, 'wb') as f:
+                self.__format.dump(items, f)
+                if self.__fsync != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self.__fsync != "never":
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            except OSError:
+                # some platforms cannot fsync a directory
+                pass
+            finally:
+                os.close(fd)
+
+    @__lock.writing
+    def reload(self):
+        """
+        deserializes the JSON file and replays the journal to __objects;
+        in sharded mode, the file of a class is only loaded when the class
+        is first used, unless the files are yet to be split from the JSON
+        file
+        """
+        with self._file_lock():
+            signature = self._file_signature()
+            if self.__sharded:
+                self.__loaded.clear()
+            if not self.__sharded or not any(
+                    os.path.exists(self._shard_path(cls_name))
+                    for cls_name in classes):
+                self._read(self.__file_path)
+                if self.__sharded:
+                    self.__loaded.update(classes)
+                    self.__changed_shards.update(classes)
+            try:
+                with open(self.__log_path, 'r') as f:
+                    for line in f:
+                        self._replay(line)
+            except IOError:
+                pass
+            FileStorage.__signature = signature
+            if self.__shared:
+                FileStorage.__generation = self._generation()
+
+    def _replay(self, line):
+        """applies one journal record to __objects"""
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # a torn final line left by an interrupted append
+            return
+        cls_name = record["key"].split(".", 1)[0]
+        self._shard(cls_name)
+        self.__changed_shards.add(cls_name)
+        if record["op"] == "delete":
+            self._pop(record["key"])
+        elif record["op"] == "update":
+            obj = self.__objects.get(record["key"])
+            if obj is None:
+                return
+            if type(obj) is dict:
+                self._put(record["key"], dict(obj, **record["fields"]))
+                return
+            for name, value in record["fields"].items():
+                if name in ("created_at", "updated_at"):
+                    value = parse_time(value)
+                setattr(obj, name, value)
+            obj.mark_clean()
+        else:
+            obj = record["obj"]
+            self._put(record["key"], obj if self.__lazy else self._load(obj))
+
+    def _load(self, obj_dict):
+        """
+        builds an unchanged instance from its to_dict() dictionary, of the
+        compact class in compact mode
+        """
+        cls = (compacts if self.__compact else classes)[obj_dict["__class__"]]
+        obj = cls(**obj_dict)
+        obj.mark_clean()
+        return obj
+
+    def _hydrate(self, key):
+        """
+        returns the object stored under key, building it if still raw;
+        readers may call it, so building takes __hydrate_lock
+        """
+        cls_name = key.split(".", 1)[0]
+        obj = self.__buckets.get(cls_name, {}).get(key)
+        if type(obj) is not dict:
+            return obj
+        with self.__hydrate_lock:
+            obj = self.__buckets[cls_name].get(key)
+            if type(obj) is not dict:
+                return obj
+            obj = self._load(obj)
+            self.__objects[key] = obj
+            self.__buckets[cls_name][key] = obj
+            self.__raw[cls_name].discard(key)
+            for entry in self.__index_entries.get(key, ()):
+                self.__indexes[entry][key] = obj
+        return obj
+
+    @staticmethod
+    def _attr(obj, cls_name, attr):
+        """returns attribute attr of obj, which may still be raw"""
+        if type(obj) is dict:
+            return obj.get(attr, getattr(classes[cls_name], attr, None))
+        return getattr(obj, attr, None)
+
+    def _put(self, key, obj):
+        """stores obj under key in __objects, __buckets and __indexes"""
+        cls_name, id = key.split(".", 1)
+        if key in self.__objects:
+            self._unindex(key)
+        self.__objects[key] = obj
+        bucket = self.__buckets.setdefault(cls_name, {})
+        if key not in bucket and cls_name in self.__sorted_ids:
+            insort(self.__sorted_ids[cls_name], id)
+        bucket[key] = obj
+        if type(obj) is dict:
+            self.__raw.setdefault(cls_name, set()).add(key)
+        elif key in self.__raw.get(cls_name, ()):
+            self.__raw[cls_name].discard(key)
+        self._index(key, obj)
+
+    def _pop(self, key):
+        """removes key from __objects, __buckets and __indexes"""
+        if key in self.__objects:
+            cls_name, id = key.split(".", 1)
+            self._unindex(key)
+            del self.__objects[key]
+            self.__buckets.get(cls_name, {}).pop(key, None)
+            self.__raw.get(cls_name, set()).discard(key)
+            ids = self.__sorted_ids.get(cls_name)
+            if ids is not None:
+                i = bisect_left(ids, id)
+                if i < len(ids) and ids[i] == id:
+                    del ids[i]
+
+    def _index(self, key, obj):
+        """files obj in __indexes under its foreign-key values"""
+        cls_name = key.split(".", 1)[0]
+        entries = []
+        for attr in indexes.get(cls_name, ()):
+            values = self._attr(obj, cls_name, attr)
+            if not isinstance(values, list):
+                values = (values,)
+            for value in values:
+                entry = (cls_name, attr, value)
+                try:
+                    bucket = self.__indexes.setdefault(entry, {})
+                except TypeError:
+                    # unhashable values, e.g. a list in amenity_ids, match
+                    # no lookup; they are left out of the index
+                    continue
+                bucket[key] = obj
+                entries.append(entry)
+        self.__index_entries[key] = entries
+
+    def _unindex(self, key):
+        """removes key from every __indexes entry it was filed under"""
+        for entry in self.__index_entries.pop(key, ()):
+            bucket = self.__indexes.get(entry)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self.__indexes[entry]
+
+    def reindex(self, obj, name):
+        """refiles obj in __indexes after its attribute name was changed"""
+        if name not in indexes.get(obj.__class__.__name__, ()):
+            return
+        key = obj.__class__.__name__ + "." + str(getattr(obj, "id", None))
+        # objects being built are not stored yet, and may be built by
+        # readers, who cannot take the lock for writing
+        if self.__objects.get(key) is not obj:
+            return
+        with self.__lock.write():
+            if self.__objects.get(key) is obj:
+                self._unindex(key)
+                self._index(key, obj)
+
+    @__lock.reading
+    def lookup(self, cls, attr, value):
+        """
+        Retrieve the objects of a class whose attribute equals a value.
+
+        Args:
+            cls (class or str): The class, or class name, to search.
+            attr (str): The attribute to compare, e.g. "state_id".
+            value: The value the attribute must have.
+
+        Returns:
+            list: The matching objects, read from the reverse index when
+            attr is an indexed foreign key. For an indexed list attribute
+            such as Place.amenity_ids, the objects whose list contains
+            value.
+        """
+        cls_name = self._class_name(cls)
+        self._shard(cls_name)
+        return [self._hydrate(key) for key in
+                self._lookup_keys(cls_name, attr, value)]
+
+    def _lookup_keys(self, cls_name, attr, value):
+        """returns the keys of the objects lookup() would return"""
+        if attr in indexes.get(cls_name, ()):
+            try:
+                return list(self.__indexes.get((cls_name, attr, value), ()))
+            except TypeError:
+                return []
+        return [key for key, obj in self.__buckets.get(cls_name, {}).items()
+                if self._attr(obj, cls_name, attr) == value]
+
+    def _file_signature(self):
+        """
+        returns the (mtime, size, inode) of the JSON file, or of the
+        files of every class in sharded mode, and of the journal
+        """
+        paths = [self.__file_path]
+        if self.__sharded:
+            paths = [self._shard_path(cls_name) for cls_name in classes]
+        signature = ()
+        for path in paths + [self.__log_path]:
+            try:
+                st = os.stat(path)
+            except OSError:
+                signature += (None,)
+                continue
+            signature += ((st.st_mtime_ns, st.st_size, st.st_ino),)
+        return signature
+
+    def invalidate(self):
+        """forces the next close() to reload the JSON file"""
+        FileStorage.__signature = None
+
+    def reload_stats(self):
+        """returns how many times close() reloaded or skipped the file"""
+        return dict(self.__reload_stats)
+
+    @__lock.reading
+    def page(self, cls, limit=None, after=None, include=(), **filters):
+        """
+        Retrieve objects of a class ordered by id, one page at a time.
+
+        Args:
+            cls (class or str): The class, or class name, to list.
+            limit (int, optional): The maximum number of objects to return.
+            after (str, optional): Only return objects whose id sorts after
+            this one, i.e. the id of the last object of the previous page.
+            include (list, optional): Relationship paths to eager-load.
+            Related objects are already in memory, so it is ignored.
+            **filters: Attribute values the objects must have, e.g.
+            state_id=<id>.
+
+        Returns:
+            list: The objects of the page.
+        """
+        cls_name = self._class_name(cls)
+        self._shard(cls_name)
+        if filters:
+            attr = next((a for a in indexes.get(cls_name, ())
+                         if a in filters), next(iter(filters)))
+            ids = sorted(key.split(".", 1)[1] for key in
+                         self._lookup_keys(cls_name, attr, filters[attr])
+                         if all(self._attr(self.__objects[key], cls_name,
+                                           name) == value
+                                for name, value in filters.items()))
+        else:
+            ids = self.__sorted_ids.get(cls_name)
+            if ids is None:
+                ids = sorted(key.split(".", 1)[1] for key in
+                             self.__buckets.get(cls_name, ()))
+                self.__sorted_ids[cls_name] = ids
+        start = bisect_right(ids, after) if after is not None else 0
+        stop = start + limit if limit is not None else None
+        return [self._hydrate(cls_name + "." + id) for id in ids[start:stop]]
+
+    @__lock.reading
+    def search_places(self, states=(), cities=(), amenities=(),
+                      limit=None, after=None):
+        """
+        Retrieve the places located in any of the given states or cities
+        that have all of the given amenities, ordered by id.
+
+        Args:
+            states (list): State ids; their cities are searched.
+            cities (list): City ids searched in addition to the states.
+            amenities (list): Amenity ids every place must have.
+            limit (int, optional): The maximum number of places to return.
+            after (str, optional): Only return places whose id sorts after
+            this one.
+
+        Returns:
+            list: The matching places. Every place matches when states
+            and cities are both empty.
+        """
+        self._shard("City")
+        self._shard("Place")
+        having = [self.__indexes.get(("Place", "amenity_ids", id), {})
+                  for id in set(amenities)]
+        having.sort(key=len)
+        if states or cities:
+            city_ids = set(cities)
+            for state_id in states:
+                city_ids.update(key.split(".", 1)[1] for key in
+                                self._lookup_keys("City", "state_id",
+                                                  state_id))
+            candidates = [key for city_id in city_ids for key in
+                          self._lookup_keys("Place", "city_id", city_id)]
+        elif having:
+            candidates = having[0]
+        else:
+            candidates = self.__buckets.get("Place", {})
+        ids = sorted(key.split(".", 1)[1] for key in candidates
+                     if all(key in bucket for bucket in having))
+        start = bisect_right(ids, after) if after is not None else 0
+        stop = start + limit if limit is not None else None
+        return [self._hydrate("Place." + id) for id in ids[start:stop]]
+
+    def iterate(self, cls, after=None, batch=1000, include=(), **filters):
+        """
+        Iterate over the objects of a class ordered by id.
+
+        The objects already live in memory, so batch and include are only
+        accepted for compatibility with DBStorage.iterate().
+
+        Returns:
+            iterator: The objects, in id order.
+        """
+        return iter(self.page(cls, None, after, **filters))
+
+    @__lock.reading
     def get(self, cls_name=None, id=None):
         """ Retrieve an instance of a specified class by its ID. """
         if cls_name is None or id is None:
             return None
 
-        key = f"{cls_name.__name__}.{id}"
-        return self.__objects.get(key)
+        self._shard(self._class_name(cls_name))
+        key = f"{self._class_name(cls_name)}.{id}"
+        return self._hydrate(key)
+
+    @__lock.reading
+    def get_many(self, cls, ids):
+        """
+        Retrieve the instances of a class with any of the given IDs.
+
+        Args:
+            cls (class or str): The class, or class name, of the instances.
+            ids (list): The IDs of the instances to retrieve.
+
+        Returns:
+            dict: The instances found, keyed by ID. IDs matching no
+            instance are left out.
+        """
+        cls_name = self._class_name(cls)
+        self._shard(cls_name)
+        found = {}
+        for id in ids:
+            obj = self._hydrate(cls_name + "." + id)
+            if obj is not None:
+                found[id] = obj
+        return found
 
+    @__lock.reading
     def count(self, cls_name=None):
         """
         Count the number of instances of a specified class or all classes
@@ -79,15 +834,58 @@ class FileStorage:
             int: The number of instances of the specified class, or the total
             number of instances if no class name is provided.
         """
-        return len(self.all(cls_name))
+        if cls_name is None:
+            for cls_name in classes:
+                self._shard(cls_name)
+            return len(self.__objects)
+        cls_name = self._class_name(cls_name)
+        self._shard(cls_name)
+        return len(self.__buckets.get(cls_name, ()))
+
+    @__lock.reading
+    def counts(self):
+        """
+        Count the instances of every class.
 
+        Returns:
+            dict: The number of instances keyed by class name.
+        """
+        return {name: self.count(name) for name in classes}
+
+    @__lock.writing
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
+            self._shard(obj.__class__.__name__)
             if key in self.__objects:
-                del self.__objects[key]
+                self._pop(key)
+                self.__dirty[key] = None
+                self.__changed_shards.add(obj.__class__.__name__)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """
+        Reload the JSON file, but only if it changed on disk since this
+        process last read or wrote it, and no save is waiting to be
+        written or being written: reloading would drop its changes. In
+        shared mode a change is a new generation, and objects deleted by
+        other processes are dropped.
+        """
+        with self.__lock.write(), self._file_lock():
+            pending = self.__commits["requested"] > \
+                self.__commits["written"] or self.__write_mutex.locked()
+            if self.__shared:
+                changed = self._generation() != self.__generation
+            else:
+                changed = self._file_signature() != self.__signature
+            if pending or not changed:
+                self.__reload_stats["skipped"] += 1
+                return
+            self.__reload_stats["performed"] += 1
+            if self.__shared:
+                self._sync()
+            else:
+                self.reload()
+
+
+atexit.register(FileStorage().flush)
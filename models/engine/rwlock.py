@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the ReadWriteLock class
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import threading
+
+
+class ReadWriteLock:
+    """
+    A lock that many threads can hold for reading at once, or one thread
+    for writing.
+
+    Writers are preferred: once a writer waits, new readers queue behind
+    it, so a steady stream of reads cannot starve writes. Both sides are
+    reentrant, and the writing thread may also read. A reader cannot
+    upgrade to writing; it would wait for itself.
+    """
+
+    def __init__(self):
+        """Initializes an unlocked lock"""
+        self.__cond = threading.Condition(threading.Lock())
+        # dictionary - read depth of each reading thread, by thread id
+        self.__readers = {}
+        self.__writer = None
+        self.__depth = 0
+        self.__waiting = 0
+
+    def acquire_read(self):
+        """waits until no writer holds or waits for the lock, then reads"""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer != me and me not in self.__readers:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+
+    def release_read(self):
+        """releases one read of the calling thread"""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__readers[me] > 1:
+                self.__readers[me] -= 1
+                return
+            del self.__readers[me]
+            if not self.__readers:
+                self.__cond.notify_all()
+
+    def acquire_write(self):
+        """waits until no other thread holds the lock, then writes"""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer == me:
+                self.__depth += 1
+                return
+            if me in self.__readers:
+                raise RuntimeError("cannot upgrade a read lock to writing")
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__cond.wait()
+            finally:
+                self.__waiting -= 1
+            self.__writer = me
+            self.__depth = 1
+
+    def release_write(self):
+        """releases one write of the calling thread"""
+        with self.__cond:
+            self.__depth -= 1
+            if not self.__depth:
+                self.__writer = None
+                self.__cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """holds the lock for reading within a with block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """holds the lock for writing within a with block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def reading(self, method):
+        """decorates a method to run holding the lock for reading"""
+        @wraps(method)
+        def locked(*args, **kwargs):
+            """runs the method holding the lock for reading"""
+            with self.read():
+                return method(*args, **kwargs)
+        return locked
+
+    def writing(self, method):
+        """decorates a method to run holding the lock for writing"""
+        @wraps(method)
+        def locked(*args, **kwargs):
+            """runs the method holding the lock for writing"""
+            with self.write():
+                return method(*args, **kwargs)
+        return locked
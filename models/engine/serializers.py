@@ -0,0 +1,301 @@
+#!/usr/bin/python3
+"""
+Serializers FileStorage can write its file with, picked by
+HBNB_FILE_FORMAT:
+
+    json    the standard library json module (the default)
+    orjson  orjson, several times faster; falls back to json when orjson
+            is not installed. Both read each other's files.
+    pickle  a binary file, about 40% smaller than the JSON one and
+            faster to load. Only load files this application wrote:
+            unpickling can run arbitrary code.
+    ndjson  one JSON record per line, written and read one record at a
+            time, so that loading a huge store never holds its whole text
+            or parsed dictionary in memory
+    snapshot  the records sorted by key, followed by a table of their
+            offsets, so that Snapshot can map the file into memory and
+            decode single records on demand (see SnapshotStorage)
+
+Each serializer turns the dictionary of to_dict() records FileStorage
+saves into bytes and back, with dumps() and loads(), or streams them to
+and from a file, with dump() and load(). The converter copies a file
+between formats, which are inferred from the file extensions:
+
+    python3 -m models.engine.serializers file.json file.pickle
+"""
+
+from io import BytesIO
+import json
+import mmap
+from operator import itemgetter
+import pickle
+import struct
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class Serializer:
+    """
+    Base of the serializers. Its dump() and load() go through dumps()
+    and loads(), holding the whole file in memory; subclasses able to
+    stream records override them.
+    """
+
+    @classmethod
+    def dump(cls, items, f):
+        """writes the (key, record) pairs of items to binary file f"""
+        f.write(cls.dumps(dict(items)))
+
+    @classmethod
+    def load(cls, f):
+        """returns the (key, record) pairs read from binary file f"""
+        return cls.loads(f.read()).items()
+
+
+class JSONSerializer(Serializer):
+    """writes the objects as JSON with the json module"""
+    extension = ".json"
+
+    @staticmethod
+    def dumps(objects):
+        """returns objects as JSON bytes"""
+        return json.dumps(objects).encode()
+
+    @staticmethod
+    def loads(data):
+        """returns the objects read from JSON bytes"""
+        return json.loads(data)
+
+
+class ORJSONSerializer(JSONSerializer):
+    """writes the objects as JSON with orjson"""
+
+    @staticmethod
+    def dumps(objects):
+        """returns objects as JSON bytes"""
+        return orjson.dumps(objects)
+
+    @staticmethod
+    def loads(data):
+        """returns the objects read from JSON bytes"""
+        return orjson.loads(data)
+
+
+class PickleSerializer(Serializer):
+    """writes the objects as a pickle"""
+    extension = ".pickle"
+
+    @staticmethod
+    def dumps(objects):
+        """returns objects as pickle bytes"""
+        return pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(data):
+        """returns the objects read from pickle bytes"""
+        return pickle.loads(data)
+
+
+class NDJSONSerializer(Serializer):
+    """
+    writes the objects as newline-delimited JSON, one record per line;
+    the key of a record is <__class__>.<id>, as FileStorage stores it
+    """
+    extension = ".ndjson"
+
+    @staticmethod
+    def dumps(objects):
+        """returns objects as newline-delimited JSON bytes"""
+        return b"".join(json.dumps(record).encode() + b"\n"
+                        for record in objects.values())
+
+    @staticmethod
+    def loads(data):
+        """returns the objects read from newline-delimited JSON bytes"""
+        records = (json.loads(line) for line in data.splitlines() if line)
+        return {record["__class__"] + "." + record["id"]: record
+                for record in records}
+
+    @classmethod
+    def dump(cls, items, f):
+        """writes the (key, record) pairs of items to f, one at a time"""
+        for key, record in items:
+            f.write(json.dumps(record).encode() + b"\n")
+
+    @classmethod
+    def load(cls, f):
+        """yields the (key, record) pairs of f, reading one line at a time"""
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["__class__"] + "." + record["id"], record
+
+
+class SnapshotSerializer(Serializer):
+    """
+    writes the objects as a snapshot: a header, then one line per record,
+    "<key>\\t<JSON record>", in key order, then a table giving the offset
+    and length of each line, in the same order
+    """
+    extension = ".snapshot"
+    magic = b"HBNBSNP1"
+    # magic, number of records, offset of the table
+    header = struct.Struct("<8sQQ")
+    # offset and length of a line
+    entry = struct.Struct("<QI")
+
+    @classmethod
+    def dumps(cls, objects):
+        """returns objects as snapshot bytes"""
+        f = BytesIO()
+        cls.dump(objects.items(), f)
+        return f.getvalue()
+
+    @classmethod
+    def loads(cls, data):
+        """returns the objects read from snapshot bytes"""
+        return dict(cls.load(BytesIO(data)))
+
+    @classmethod
+    def dump(cls, items, f):
+        """writes the (key, record) pairs of items to seekable file f"""
+        f.write(cls.header.pack(cls.magic, 0, 0))
+        lines = []
+        for key, record in sorted(items, key=itemgetter(0)):
+            line = key.encode() + b"\t" + json.dumps(record).encode()
+            lines.append(cls.entry.pack(f.tell(), len(line)))
+            f.write(line + b"\n")
+        table = f.tell()
+        f.write(b"".join(lines))
+        f.seek(0)
+        f.write(cls.header.pack(cls.magic, len(lines), table))
+        f.seek(0, 2)
+
+    @classmethod
+    def load(cls, f):
+        """yields the (key, record) pairs of f, one line at a time"""
+        magic, count, table = cls.header.unpack(f.read(cls.header.size))
+        if magic != cls.magic:
+            raise ValueError("not a snapshot")
+        for i in range(count):
+            key, _, record = f.readline().rstrip(b"\n").partition(b"\t")
+            yield key.decode(), json.loads(record)
+
+
+class Snapshot:
+    """
+    A snapshot file mapped into memory, read-only.
+
+    Lookups binary-search the table of the file and decode only the
+    records they return. Opening a snapshot therefore takes the same
+    time whatever its size, and processes mapping the same file share
+    one copy of it in the page cache. Records are numbered 0 to
+    len(snapshot) - 1 in key order.
+    """
+
+    def __init__(self, path):
+        """Maps the snapshot file at path"""
+        with open(path, 'rb') as f:
+            self.__data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.__count, self.__table = \
+            SnapshotSerializer.header.unpack_from(self.__data)
+        if magic != SnapshotSerializer.magic:
+            raise ValueError("{} is not a snapshot".format(path))
+
+    def __len__(self):
+        """returns the number of records"""
+        return self.__count
+
+    def _entry(self, i):
+        """returns the offset and length of line i"""
+        return SnapshotSerializer.entry.unpack_from(
+            self.__data, self.__table + i * SnapshotSerializer.entry.size)
+
+    def key(self, i):
+        """returns the key of record i"""
+        offset, length = self._entry(i)
+        end = self.__data.find(b"\t", offset, offset + length)
+        return self.__data[offset:end].decode()
+
+    def record(self, i):
+        """returns the key and the decoded record i"""
+        offset, length = self._entry(i)
+        key, _, record = \
+            self.__data[offset:offset + length].partition(b"\t")
+        return key.decode(), json.loads(record)
+
+    def bisect(self, key):
+        """returns the number of the first record whose key is not < key"""
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, key):
+        """returns the decoded record of key, or None"""
+        i = self.bisect(key)
+        if i < self.__count and self.key(i) == key:
+            return self.record(i)[1]
+        return None
+
+    def range(self, prefix):
+        """returns the (start, stop) numbers of the keys starting prefix"""
+        return (self.bisect(prefix),
+                self.bisect(prefix[:-1] + chr(ord(prefix[-1]) + 1)))
+
+
+serializers = {"json": JSONSerializer,
+               "orjson": ORJSONSerializer if orjson else JSONSerializer,
+               "pickle": PickleSerializer,
+               "ndjson": NDJSONSerializer,
+               "snapshot": SnapshotSerializer}
+
+
+def by_extension(path):
+    """returns the fastest serializer for the file extension of path"""
+    for name in ("pickle", "ndjson", "snapshot"):
+        if path.endswith(serializers[name].extension):
+            return serializers[name]
+    return serializers["orjson"]
+
+
+def convert(source, destination):
+    """
+    Copy a FileStorage file to another format.
+
+    Args:
+        source (str): The path of the file to read, e.g. file.json.
+        destination (str): The path of the file to write, e.g.
+        file.pickle. The formats follow the extensions of both paths.
+
+    Returns:
+        int: The number of objects copied.
+    """
+    count = 0
+
+    def counted(items):
+        """yields items, counting them"""
+        nonlocal count
+        for item in items:
+            count += 1
+            yield item
+
+    with open(source, 'rb') as f, open(destination, 'wb') as g:
+        records = counted(by_extension(source).load(f))
+        by_extension(destination).dump(records, g)
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python3 -m models.engine.serializers SOURCE DESTINATION")
+        sys.exit(1)
+    print("{} objects copied".format(convert(sys.argv[1], sys.argv[2])))
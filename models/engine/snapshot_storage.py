@@ -0,0 +1,292 @@
+#!/usr/bin/python3
+"""
+Contains the SnapshotStorage class
+"""
+
+from os import getenv
+import os
+from models.engine.file_storage import classes
+from models.engine.serializers import Snapshot
+
+
+class SnapshotStorage:
+    """
+    Serves the objects of a snapshot file (HBNB_FILE_FORMAT=snapshot),
+    read-only, for replicas of the API that do not write.
+
+    The file is mapped into memory rather than parsed: startup takes the
+    same time whatever the size of the store, processes share one copy of
+    it in the page cache, and each lookup decodes only the records it
+    returns. The objects returned are built anew on each call; changing
+    them has no effect on the store, and saving them raises
+    PermissionError.
+    """
+
+    # string - path to the snapshot file
+    __file_path = getenv("HBNB_FILE_SNAPSHOT", "file.snapshot")
+    # Snapshot - the mapped file, None when there is no file
+    __snapshot = None
+    # tuple - (mtime, size, inode) of the file when it was last mapped
+    __signature = None
+    # dictionary - how often close() remapped the file versus skipped it
+    __reload_stats = {"performed": 0, "skipped": 0}
+
+    def all(self, cls=None):
+        """
+        returns a dictionary of the objects, or of the objects of one
+        class (given as a class or a class name), by <class name>.id
+        """
+        snapshot = self.__snapshot
+        if snapshot is None:
+            return {}
+        if cls is None:
+            indexes = range(len(snapshot))
+        else:
+            indexes = range(*snapshot.range(self._class_name(cls) + "."))
+        return {obj.__class__.__name__ + "." + obj.id: obj
+                for obj in self._objects(snapshot, indexes)}
+
+    @staticmethod
+    def _class_name(cls):
+        """returns the name of cls, which may be a class or a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    @staticmethod
+    def _load(record):
+        """builds an unchanged instance from its to_dict() dictionary"""
+        obj = classes[record["__class__"]](**record)
+        obj.mark_clean()
+        return obj
+
+    def _objects(self, snapshot, indexes, **filters):
+        """
+        returns the objects of the records numbered indexes whose
+        attributes have the values of filters
+        """
+        objs = []
+        for i in indexes:
+            record = snapshot.record(i)[1]
+            if all(self._matches(record, name, value)
+                   for name, value in filters.items()):
+                objs.append(self._load(record))
+        return objs
+
+    @staticmethod
+    def _matches(record, name, value):
+        """
+        tells whether attribute name of a record has value, or contains
+        it for a list attribute such as Place.amenity_ids
+        """
+        cls = classes[record["__class__"]]
+        attr = record.get(name, getattr(cls, name, None))
+        if isinstance(attr, list) and not isinstance(value, list):
+            return value in attr
+        return attr == value
+
+    def new(self, obj):
+        """refuses to add obj: the snapshot is read-only"""
+        raise PermissionError("snapshot storage is read-only")
+
+    def save(self, wait=None):
+        """refuses to save: the snapshot is read-only"""
+        raise PermissionError("snapshot storage is read-only")
+
+    def bulk_new(self, objs):
+        """refuses to add objs: the snapshot is read-only"""
+        raise PermissionError("snapshot storage is read-only")
+
+    def bulk_save(self):
+        """refuses to save: the snapshot is read-only"""
+        raise PermissionError("snapshot storage is read-only")
+
+    def delete(self, obj=None):
+        """refuses to delete obj: the snapshot is read-only"""
+        raise PermissionError("snapshot storage is read-only")
+
+    def reindex(self, obj, name):
+        """does nothing: the snapshot has no in-memory index to update"""
+
+    def reload(self):
+        """maps the snapshot file, replacing the previous mapping"""
+        signature = self._file_signature()
+        try:
+            snapshot = Snapshot(self.__file_path)
+        except FileNotFoundError:
+            snapshot = None
+        # threads still reading the previous mapping keep it alive
+        SnapshotStorage.__snapshot = snapshot
+        SnapshotStorage.__signature = signature
+
+    def close(self):
+        """maps the snapshot file again, but only if it was replaced"""
+        if self._file_signature() == self.__signature:
+            self.__reload_stats["skipped"] += 1
+            return
+        self.__reload_stats["performed"] += 1
+        self.reload()
+
+    def _file_signature(self):
+        """returns the (mtime, size, inode) of the snapshot file"""
+        try:
+            st = os.stat(self.__file_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def invalidate(self):
+        """forces the next close() to map the file again"""
+        SnapshotStorage.__signature = None
+
+    def reload_stats(self):
+        """returns how many times close() remapped or skipped the file"""
+        return dict(self.__reload_stats)
+
+    def lookup(self, cls, attr, value):
+        """
+        Retrieve the objects of a class whose attribute equals a value.
+
+        Args:
+            cls (class or str): The class, or class name, to search.
+            attr (str): The attribute to compare, e.g. "state_id".
+            value: The value the attribute must have, or contain for a
+            list attribute such as Place.amenity_ids.
+
+        Returns:
+            list: The matching objects, in id order. The records of the
+            class are scanned, as the snapshot has no reverse index.
+        """
+        return self.page(cls, **{attr: value})
+
+    def page(self, cls, limit=None, after=None, include=(), **filters):
+        """
+        Retrieve objects of a class ordered by id, one page at a time.
+
+        Args:
+            cls (class or str): The class, or class name, to list.
+            limit (int, optional): The maximum number of objects to return.
+            after (str, optional): Only return objects whose id sorts after
+            this one, i.e. the id of the last object of the previous page.
+            include (list, optional): Relationship paths to eager-load.
+            Related objects are read on access, so it is ignored.
+            **filters: Attribute values the objects must have, e.g.
+            state_id=<id>.
+
+        Returns:
+            list: The objects of the page.
+        """
+        snapshot = self.__snapshot
+        if snapshot is None:
+            return []
+        prefix = self._class_name(cls) + "."
+        start, stop = snapshot.range(prefix)
+        if after is not None:
+            start = snapshot.bisect(prefix + after)
+            if start < stop and snapshot.key(start) == prefix + after:
+                start += 1
+        if filters:
+            objs = self._objects(snapshot, range(start, stop), **filters)
+            return objs[:limit]
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self._objects(snapshot, range(start, stop))
+
+    def search_places(self, states=(), cities=(), amenities=(),
+                      limit=None, after=None):
+        """
+        Retrieve the places located in any of the given states or cities
+        that have all of the given amenities, ordered by id.
+
+        Args:
+            states (list): State ids; their cities are searched.
+            cities (list): City ids searched in addition to the states.
+            amenities (list): Amenity ids every place must have.
+            limit (int, optional): The maximum number of places to return.
+            after (str, optional): Only return places whose id sorts after
+            this one.
+
+        Returns:
+            list: The matching places. Every place matches when states
+            and cities are both empty.
+        """
+        city_ids = set(cities)
+        for state_id in states:
+            city_ids.update(city.id for city in
+                            self.lookup("City", "state_id", state_id))
+        places = []
+        for place in self.page("Place", after=after):
+            if (states or cities) and place.city_id not in city_ids:
+                continue
+            if not set(amenities) <= set(place.amenity_ids):
+                continue
+            places.append(place)
+            if limit is not None and len(places) == limit:
+                break
+        return places
+
+    def iterate(self, cls, after=None, batch=1000, include=(), **filters):
+        """
+        Iterate over the objects of a class ordered by id, decoding them
+        batch records at a time.
+
+        Returns:
+            iterator: The objects, in id order.
+        """
+        while True:
+            objs = self.page(cls, batch, after, **filters)
+            yield from objs
+            if len(objs) < batch:
+                return
+            after = objs[-1].id
+
+    def get(self, cls_name=None, id=None):
+        """ Retrieve an instance of a specified class by its ID. """
+        snapshot = self.__snapshot
+        if cls_name is None or id is None or snapshot is None:
+            return None
+        record = snapshot.get(self._class_name(cls_name) + "." + id)
+        return None if record is None else self._load(record)
+
+    def get_many(self, cls, ids):
+        """
+        Retrieve the instances of a class with any of the given IDs.
+
+        Returns:
+            dict: The instances found, keyed by ID. IDs matching no
+            instance are left out.
+        """
+        found = {}
+        for id in ids:
+            obj = self.get(cls, id)
+            if obj is not None:
+                found[id] = obj
+        return found
+
+    def count(self, cls_name=None):
+        """
+        Count the number of instances of a specified class or all classes
+        if no class name is provided.
+
+        Args:
+            cls_name (str, optional): The name of the class type to count
+            instances of. Defaults to None.
+
+        Returns:
+            int: The number of instances, read from the table of the file
+            without decoding any record.
+        """
+        snapshot = self.__snapshot
+        if snapshot is None:
+            return 0
+        if cls_name is None:
+            return len(snapshot)
+        start, stop = snapshot.range(self._class_name(cls_name) + ".")
+        return stop - start
+
+    def counts(self):
+        """
+        Count the instances of every class.
+
+        Returns:
+            dict: The number of instances keyed by class name.
+        """
+        return {name: self.count(name) for name in classes}
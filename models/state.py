@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 """ holds class State"""
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, loading
 from models.city import City
 from os import getenv
 import sqlalchemy
@@ -14,7 +14,8 @@ class State(BaseModel, Base):
     if models.storage_t == "db":
         __tablename__ = 'states'
         name = Column(String(128), nullable=False)
-        cities = relationship("City", backref="state")
+        cities = relationship("City", backref="state",
+                              lazy=loading("State.cities"))
     else:
         name = ""
 
@@ -26,9 +27,4 @@ class State(BaseModel, Base):
         @property
         def cities(self):
             """getter for list of city instances related to the state"""
-            city_list = []
-            all_cities = models.storage.all(City)
-            for city in all_cities.values():
-                if city.state_id == self.id:
-                    city_list.append(city)
-            return city_list
+            return models.storage.lookup(City, "state_id", self.id)
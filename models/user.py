@@ -2,13 +2,18 @@
 """ holds class User"""
 import hashlib
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, loading
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String
 from sqlalchemy.orm import relationship
 
 
+def hash_password(value):
+    """returns the md5 digest a password is stored as"""
+    return hashlib.md5(value.encode()).hexdigest()
+
+
 class User(BaseModel, Base):
     """Representation of a user """
     if models.storage_t == 'db':
@@ -17,8 +22,10 @@ class User(BaseModel, Base):
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
         last_name = Column(String(128), nullable=True)
-        places = relationship("Place", backref="user")
-        reviews = relationship("Review", backref="user")
+        places = relationship("Place", backref="user",
+                              lazy=loading("User.places"))
+        reviews = relationship("Review", backref="user",
+                               lazy=loading("User.reviews"))
     else:
         email = ""
         password = ""
@@ -32,5 +39,5 @@ class User(BaseModel, Base):
     def __setattr__(self, name, value):
         """sets password"""
         if name == 'password':
-            value = hashlib.md5(value.encode()).hexdigest()
+            value = hash_password(value)
         super().__setattr__(name, value)
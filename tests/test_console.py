@@ -1,12 +1,18 @@
 #!/usr/bin/python3
 """
-Contains the class TestConsoleDocs
+Contains the TestConsoleDocs and TestConsoleImport classes
 """
 
 import console
 import inspect
+from io import StringIO
+import models
+from models.engine.serializers import NDJSONSerializer
+from models.state import State
+import os
 import pep8
 import unittest
+from unittest import mock
 HBNBCommand = console.HBNBCommand
 
 
@@ -39,3 +45,52 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestConsoleImport(unittest.TestCase):
+    """Test the import command of the console"""
+
+    def tearDown(self):
+        """Remove the file imported by the tests"""
+        if os.path.exists("test.ndjson"):
+            os.remove("test.ndjson")
+
+    def test_import(self):
+        """Test that import creates the objects of a file in bulk"""
+        states = [State(name="Volta"), State(name="Oti")]
+        with open("test.ndjson", "wb") as f:
+            NDJSONSerializer.dump(
+                (("State." + s.id, s.to_dict()) for s in states), f)
+        with mock.patch.object(models.storage, "bulk_save",
+                               wraps=models.storage.bulk_save) as bulk_save:
+            with mock.patch("sys.stdout", new=StringIO()) as out:
+                HBNBCommand().onecmd("import test.ndjson")
+        self.assertEqual(out.getvalue(), "2\n")
+        self.assertEqual(bulk_save.call_count, 1)
+        for state in states:
+            self.assertEqual(models.storage.get(State, state.id).name,
+                             state.name)
+
+    def test_import_missing_file(self):
+        """Test that import reports a missing file"""
+        with mock.patch("sys.stdout", new=StringIO()) as out:
+            HBNBCommand().onecmd("import missing.ndjson")
+        self.assertEqual(out.getvalue(), "** file doesn't exist **\n")
+
+    def test_import_invalid_files(self):
+        """Test that import reports invalid records and refuses pickles"""
+        for path, data, error in [
+                ("test.ndjson", b'{"__class__": "Nothing", "id": "1"}\n',
+                 "** class doesn't exist **"),
+                ("test.ndjson", b'{"__class__": "State", "id": "1", '
+                 b'"created_at": "garbage"}\n', "** invalid file **"),
+                ("test.ndjson", b'not json\n', "** invalid file **"),
+                ("test.pickle", b'', "** pickle files can't be imported **")]:
+            with self.subTest(data=data):
+                with open(path, "wb") as f:
+                    f.write(data)
+                with mock.patch("sys.stdout", new=StringIO()) as out:
+                    HBNBCommand().onecmd("import " + path)
+                self.assertEqual(out.getvalue(), error + "\n")
+        os.remove("test.pickle")
@@ -158,3 +158,34 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @mock.patch('models.storage')
+    def test_save_skips_unchanged(self, mock_storage):
+        """Test that save does nothing when no attribute changed"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        inst.save()
+        self.assertEqual(inst.changed_fields(), set())
+        mock_storage.save.reset_mock()
+        old_updated_at = inst.updated_at
+        inst.name = "Holberton"
+        inst.save()
+        self.assertFalse(mock_storage.save.called)
+        self.assertEqual(old_updated_at, inst.updated_at)
+        inst.name = "School"
+        self.assertEqual(inst.changed_fields(), {"name"})
+        inst.save()
+        self.assertTrue(mock_storage.save.called)
+
+    def test_time_codec_matches_strftime(self):
+        """Test that format_time and parse_time match strftime/strptime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for stamp in [datetime(2017, 6, 14, 22, 31, 3, 285259),
+                      datetime(2017, 6, 14, 22, 31, 3),
+                      datetime.utcnow()]:
+            with self.subTest(stamp=stamp):
+                string = stamp.strftime(t_format)
+                self.assertEqual(models.base_model.format_time(stamp),
+                                 string)
+                self.assertEqual(models.base_model.parse_time(string),
+                                 stamp)
@@ -83,7 +83,7 @@ class TestFileStorage(unittest.TestCase):
     def test_new(self):
         """test that new adds an object to the database"""
 
-    @unittest.skipIf(models.s]torage_t != 'db', "not testing db storage")
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
 
@@ -127,3 +127,136 @@ class TestFileStorage(unittest.TestCase):
 
         # Verify that both counts are equall when compared
         self.assertEqual(states_from_all, states_from_count)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_by_class_or_name(self):
+        """Test that count accepts a class or a class name"""
+        before = models.storage.count(State)
+        state = State(name="Oti")
+        models.storage.new(state)
+        models.storage.save()
+        self.assertEqual(models.storage.count(State), before + 1)
+        self.assertEqual(models.storage.count("State"), before + 1)
+        models.storage.delete(state)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_uses_identity_map(self):
+        """Test that get accepts a class name and skips loaded objects"""
+        from sqlalchemy import event
+        state = State(name="Bono")
+        models.storage.new(state)
+        models.storage.save()
+        statements = []
+
+        def count(*args):
+            """counts the statements sent to the database"""
+            statements.append(args)
+        engine = models.storage._DBStorage__engine
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            self.assertIs(models.storage.get(State, state.id), state)
+            self.assertIs(models.storage.get("State", state.id), state)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(statements, [])
+        self.assertIsNone(models.storage.get("Nothing", state.id))
+        models.storage.delete(state)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_many(self):
+        """Test that get_many returns the objects found, by id"""
+        states = [State(name="Ahafo"), State(name="Western North")]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        found = models.storage.get_many(
+            "State", [states[0].id, states[1].id, "missing"])
+        self.assertEqual(found, {state.id: state for state in states})
+        self.assertEqual(models.storage.get_many(State, []), {})
+        for state in states:
+            models.storage.delete(state)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_save(self):
+        """Test that bulk_save inserts parents first, in chunks"""
+        state = State(name="Eastern")
+        cities = [City(name="Koforidua", state_id=state.id)
+                  for i in range(3)]
+        models.storage.bulk_new(cities + [state])
+        models.storage.bulk_save()
+        models.storage.close()
+        for obj in cities + [state]:
+            loaded = models.storage.get(type(obj), obj.id)
+            self.assertIsNot(loaded, obj)
+            self.assertEqual(loaded.name, obj.name)
+        for obj in cities + [state]:
+            models.storage.delete(models.storage.get(type(obj), obj.id))
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_queue_per_thread(self):
+        """Test that bulk_save only inserts what its thread queued"""
+        import threading
+        mine, theirs = State(name="Bono East"), State(name="North East")
+        models.storage.bulk_new([mine])
+
+        def other():
+            """queues and saves a state in another thread"""
+            models.storage.bulk_new([theirs])
+            models.storage.bulk_save()
+            models.storage.close()
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+        self.assertIsNotNone(models.storage.get(State, theirs.id))
+        self.assertIsNone(models.storage.get(State, mine.id))
+        models.storage.bulk_save()
+        self.assertIsNotNone(models.storage.get(State, mine.id))
+        for state in (mine, theirs):
+            models.storage.delete(models.storage.get(State, state.id))
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts_matches_count(self):
+        """Test that counts returns count for every class at once"""
+        counts = models.storage.counts()
+        for name in classes:
+            self.assertEqual(counts[name], models.storage.count(name))
+        self.assertEqual(sum(counts.values()), models.storage.count())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page_include_eager_loads(self):
+        """Test that page loads included relationships up front"""
+        state = State(name="Savannah")
+        models.storage.new(state)
+        models.storage.new(City(name="Tamale", state_id=state.id))
+        models.storage.save()
+        states = models.storage.page(State, include=["cities"])
+        loaded = [s for s in states if s.id == state.id][0]
+        self.assertIn("cities", loaded.__dict__)
+        self.assertNotIn("cities", loaded.to_dict())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_iterate_include(self):
+        """Test that iterate streams objects with included relationships"""
+        state = State(name="Volta")
+        models.storage.new(state)
+        models.storage.new(City(name="Ho", state_id=state.id))
+        models.storage.save()
+        states = models.storage.iterate(State, batch=1, include=["cities"])
+        loaded = [s for s in states if s.id == state.id][0]
+        self.assertIn("cities", loaded.__dict__)
+        self.assertEqual(len(loaded.cities), 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that pool_stats reports the pool and its checkouts"""
+        models.storage.count(State)
+        stats = models.storage.pool_stats()
+        self.assertGreaterEqual(stats["checkout"], 1)
+        self.assertGreaterEqual(stats["waits"]["count"], 1)
+        self.assertEqual(stats["size"],
+                         int(os.getenv('HBNB_MYSQL_POOL_SIZE', 5)))
@@ -7,6 +7,8 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.serializers import JSONSerializer, NDJSONSerializer, \
+    PickleSerializer
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,7 +19,12 @@ from models.user import User
 import json
 import os
 import pep8
+import subprocess
+import sys
+import threading
+import tracemalloc
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -131,6 +138,17 @@ class TestFileStorage(unittest.TestCase):
         # Verify that the retrieved object is the same as the created object
         self.assertEqual(state, state_object)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_many(self):
+        """Test that get_many returns the objects found, by id"""
+        storage = FileStorage()
+        states = [State(name="Ahafo"), State(name="Western North")]
+        for state in states:
+            storage.new(state)
+        found = storage.get_many("State", [s.id for s in states] + ["x"])
+        self.assertEqual(found, {state.id: state for state in states})
+        self.assertEqual(storage.get_many(City, [states[0].id]), {})
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_count(self):
         """
@@ -154,3 +172,635 @@ class TestFileStorage(unittest.TestCase):
 
         # Verify that both counts are equall when compared
         self.assertEqual(states_from_all, states_from_count)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_skips_unchanged_file(self):
+        """Test that close only reloads when file.json changed on disk"""
+        storage = FileStorage()
+        storage.new(State(name="Volta"))
+        storage.save()
+        before = storage.reload_stats()
+        storage.close()
+        after = storage.reload_stats()
+        self.assertEqual(after["skipped"], before["skipped"] + 1)
+        self.assertEqual(after["performed"], before["performed"])
+        storage.invalidate()
+        storage.close()
+        after = storage.reload_stats()
+        self.assertEqual(after["performed"], before["performed"] + 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_save_and_reload(self):
+        """Test that journal mode appends changes and reload replays them"""
+        storage = FileStorage()
+        storage.compact()
+        FileStorage._FileStorage__journal = True
+        try:
+            state = State(name="Ashanti")
+            storage.new(state)
+            storage.save()
+            with open("file.json.log", "r") as f:
+                lines = f.readlines()
+            self.assertEqual(len(lines), 1)
+            self.assertEqual(json.loads(lines[0])["obj"]["name"], "Ashanti")
+            key = "State." + state.id
+            del FileStorage._FileStorage__objects[key]
+            storage.reload()
+            self.assertEqual(storage.all()[key].name, "Ashanti")
+            storage.delete(storage.all()[key])
+            storage.save()
+            storage.reload()
+            self.assertNotIn(key, storage.all())
+        finally:
+            FileStorage._FileStorage__journal = False
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_compaction(self):
+        """Test that a journal past its size threshold is compacted"""
+        storage = FileStorage()
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__journal_max = 0
+        try:
+            state = State(name="Bono")
+            storage.new(state)
+            storage.save()
+            self.assertFalse(os.path.exists("file.json.log"))
+            with open("file.json", "r") as f:
+                self.assertIn("State." + state.id, json.load(f))
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__journal_max = 1024 * 1024
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lookup_foreign_key_index(self):
+        """Test that lookup follows new, delete and attribute updates"""
+        storage = FileStorage()
+        state = State(name="Central")
+        other = State(name="Eastern")
+        city = City(name="Cape Coast", state_id=state.id)
+        storage.new(city)
+        self.assertEqual(storage.lookup(City, "state_id", state.id), [city])
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(storage.lookup("City", "state_id", state.id), [])
+        self.assertEqual(other.cities, [city])
+        storage.delete(city)
+        self.assertEqual(other.cities, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_unhashable_list_elements(self):
+        """Test that unhashable amenity_ids elements are not indexed"""
+        storage = FileStorage()
+        place = Place(city_id="c", user_id="u", name="Hut",
+                      amenity_ids=["a"])
+        storage.new(place)
+        place.amenity_ids = [["x"], "b"]
+        self.assertEqual(storage.lookup(Place, "amenity_ids", "a"), [])
+        self.assertEqual(storage.lookup(Place, "amenity_ids", "b"), [place])
+        self.assertEqual(storage.lookup(Place, "amenity_ids", ["x"]), [])
+        storage.save()
+        storage.reload()
+        key = "Place." + place.id
+        self.assertEqual(storage.all(Place)[key].amenity_ids, [["x"], "b"])
+        storage.delete(storage.all(Place)[key])
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_and_count_by_class_bucket(self):
+        """Test that all(cls) and count(cls) follow the class buckets"""
+        storage = FileStorage()
+        before = storage.count("Amenity")
+        amenity = Amenity(name="Pool")
+        storage.new(amenity)
+        key = "Amenity." + amenity.id
+        self.assertIs(storage.all(Amenity)[key], amenity)
+        self.assertIs(storage.all("Amenity")[key], amenity)
+        self.assertEqual(storage.count(Amenity), before + 1)
+        self.assertNotIn(key, storage.all(State))
+        storage.delete(amenity)
+        self.assertEqual(storage.count("Amenity"), before)
+        self.assertNotIn(key, storage.all(Amenity))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts_matches_count(self):
+        """Test that counts returns count for every class at once"""
+        counts = models.storage.counts()
+        for name in classes:
+            self.assertEqual(counts[name], models.storage.count(name))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_by_id(self):
+        """Test that page walks objects in id order with limit and after"""
+        storage = FileStorage()
+        state = State(name="Upper East")
+        for i in range(5):
+            storage.new(City(name="Bolgatanga", state_id=state.id))
+        cities = storage.page(City, state_id=state.id)
+        ids = [city.id for city in cities]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(ids), 5)
+        first = storage.page(City, 2, None, state_id=state.id)
+        second = storage.page(City, 2, first[-1].id, state_id=state.id)
+        self.assertEqual([city.id for city in first + second], ids[:4])
+        everything = [city.id for city in storage.page("City")]
+        self.assertEqual(everything, sorted(everything))
+        storage.new(City(name="Navrongo", state_id=state.id))
+        everything = [city.id for city in storage.page("City")]
+        self.assertEqual(everything, sorted(everything))
+        self.assertEqual(len(everything), storage.count(City))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places(self):
+        """Test that search_places combines states, cities and amenities"""
+        storage = FileStorage()
+        state = State(name="Western")
+        city = City(name="Takoradi", state_id=state.id)
+        other = City(name="Tarkwa", state_id=state.id)
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        first = Place(city_id=city.id, amenity_ids=[wifi.id, pool.id])
+        second = Place(city_id=other.id, amenity_ids=[wifi.id])
+        for obj in [state, city, other, wifi, pool, first, second]:
+            storage.new(obj)
+        found = storage.search_places(states=[state.id])
+        self.assertEqual(sorted([first.id, second.id]),
+                         [place.id for place in found])
+        found = storage.search_places(cities=[other.id])
+        self.assertEqual([second], found)
+        found = storage.search_places(amenities=[wifi.id, pool.id])
+        self.assertEqual([first], found)
+        second.amenity_ids = second.amenity_ids + [pool.id]
+        found = storage.search_places(states=[state.id],
+                                      amenities=[pool.id], limit=1)
+        self.assertEqual([min(first, second, key=lambda p: p.id)], found)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_records_changed_fields(self):
+        """Test that journal mode appends only the fields that changed"""
+        storage = FileStorage()
+        state = State(name="Ahafo")
+        storage.new(state)
+        storage.compact()
+        FileStorage._FileStorage__journal = True
+        try:
+            state.name = "Bono East"
+            storage.new(state)
+            storage.save()
+            with open("file.json.log", "r") as f:
+                record = json.loads(f.readlines()[-1])
+            self.assertEqual(record["op"], "update")
+            self.assertEqual(record["fields"], {"name": "Bono East"})
+            storage.reload()
+            self.assertEqual(storage.all()["State." + state.id].name,
+                             "Bono East")
+        finally:
+            FileStorage._FileStorage__journal = False
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload_hydrates_on_access(self):
+        """Test that lazy mode builds instances only when accessed"""
+        storage = FileStorage()
+        state = State(name="Northern")
+        city = City(name="Tamale", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        storage.compact()
+        objects = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            self.assertIs(type(objects["State." + state.id]), dict)
+            self.assertIs(type(objects["City." + city.id]), dict)
+            count = storage.count(State)
+            loaded = storage.get(State, state.id)
+            self.assertIs(type(loaded), State)
+            self.assertIs(objects["State." + state.id], loaded)
+            self.assertEqual(storage.count(State), count)
+            self.assertIs(type(objects["City." + city.id]), dict)
+            self.assertEqual([c.id for c in loaded.cities], [city.id])
+            self.assertIs(type(objects["City." + city.id]), City)
+        finally:
+            FileStorage._FileStorage__lazy = False
+            storage.all()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_reload_uses_slots(self):
+        """Test that compact mode loads slotted instances that behave alike"""
+        storage = FileStorage()
+        place = Place(name="Labadi", city_id="c", number_rooms=3)
+        storage.new(place)
+        storage.compact()
+        FileStorage._FileStorage__compact = True
+        try:
+            storage.reload()
+            loaded = storage.get(Place, place.id)
+            self.assertIsNot(type(loaded), Place)
+            self.assertEqual(type(loaded).__name__, "Place")
+            self.assertFalse(hasattr(loaded, "__dict__"))
+            self.assertEqual(loaded.to_dict(), place.to_dict())
+            self.assertTrue(str(loaded).startswith(
+                "[Place] ({}) {{".format(place.id)))
+            self.assertIn("'number_rooms': 3", str(loaded))
+            self.assertEqual(loaded.max_guest, 0)
+            self.assertEqual(loaded.changed_fields(), set())
+            loaded.max_guest = 4
+            loaded.pool = True
+            self.assertEqual(loaded.changed_fields(), {"max_guest", "pool"})
+            loaded.save()
+            storage.reload()
+            loaded = storage.get(Place, place.id)
+            self.assertEqual(loaded.max_guest, 4)
+            self.assertTrue(loaded.pool)
+            loaded.city_id = "d"
+            self.assertEqual([p.id for p in storage.lookup(Place, "city_id",
+                                                           "d")], [place.id])
+        finally:
+            FileStorage._FileStorage__compact = False
+            storage.reload()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reload_pickle_format(self):
+        """Test that the pickle format saves and reloads the objects"""
+        storage = FileStorage()
+        state = State(name="Oti")
+        storage.new(state)
+        FileStorage._FileStorage__format = PickleSerializer
+        FileStorage._FileStorage__file_path = "file.pickle"
+        try:
+            storage.save()
+            with open("file.pickle", "rb") as f:
+                saved = PickleSerializer.loads(f.read())
+            self.assertEqual(saved["State." + state.id], state.to_dict())
+            del FileStorage._FileStorage__objects["State." + state.id]
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name, "Oti")
+        finally:
+            FileStorage._FileStorage__format = JSONSerializer
+            FileStorage._FileStorage__file_path = "file.json"
+            if os.path.exists("file.pickle"):
+                os.remove("file.pickle")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_replaces_file_atomically(self):
+        """Test that a failed save leaves the previous file intact"""
+        storage = FileStorage()
+        state = State(name="Savannah")
+        storage.new(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            before = f.read()
+        state.name = "Upper East"
+        storage.new(state)
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(f.read(), before)
+        self.assertFalse([path for path in os.listdir(".")
+                          if path.endswith(".tmp")])
+        storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["State." + state.id]["name"], "Upper East")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_does_not_block_readers(self):
+        """Test that readers go on while a save writes the file"""
+        storage = FileStorage()
+        state = State(name="Bono")
+        storage.new(state)
+        write_atomic = FileStorage._write_atomic
+        read = []
+
+        def slow_write(self, path, items):
+            """reads storage from another thread while writing the file"""
+            reader = threading.Thread(
+                target=lambda: read.append(storage.get(State, state.id)))
+            reader.start()
+            reader.join(5)
+            return write_atomic(self, path, items)
+        with mock.patch.object(FileStorage, "_write_atomic", slow_write):
+            storage.save()
+        self.assertEqual(read, [state])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_failed_journal_write_stays_dirty(self):
+        """Test that the changes of a failed write go in the next one"""
+        storage = FileStorage()
+        FileStorage._FileStorage__journal = True
+        try:
+            state = State(name="Oti")
+            storage.new(state)
+            with mock.patch("models.engine.file_storage.json.dumps",
+                            side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    storage.save()
+            storage.save()
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name, "Oti")
+        finally:
+            FileStorage._FileStorage__journal = False
+            storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_fsync_policy(self):
+        """Test that saves fsync according to the configured policy"""
+        storage = FileStorage()
+        state = State(name="Western")
+        calls = {}
+        try:
+            for journal, policy in [(False, "never"), (False, "snapshot"),
+                                    (True, "snapshot"), (True, "always")]:
+                FileStorage._FileStorage__journal = journal
+                FileStorage._FileStorage__fsync = policy
+                state.name = policy
+                storage.new(state)
+                with mock.patch("os.fsync") as fsync:
+                    storage.save()
+                calls[(journal, policy)] = fsync.call_count
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__fsync = "snapshot"
+            storage.compact()
+        self.assertEqual(calls, {(False, "never"): 0, (False, "snapshot"): 2,
+                                 (True, "snapshot"): 0, (True, "always"): 1})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_group_commit_batches_saves(self):
+        """Test that group-commit mode writes several saves at once"""
+        storage = FileStorage()
+        storage.save()
+        FileStorage._FileStorage__group_commit = True
+        FileStorage._FileStorage__commit_delay = 60
+        FileStorage._FileStorage__commit_batch = 3
+        try:
+            states = [State(name="Region {}".format(i)) for i in range(3)]
+            stats = storage.reload_stats()
+            for state in states[:2]:
+                storage.new(state)
+                storage.save()
+            storage.close()
+            self.assertEqual(storage.reload_stats()["skipped"],
+                             stats["skipped"] + 1)
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + states[0].id, json.load(f))
+            storage.new(states[2])
+            storage.save(wait=True)
+            with open("file.json", "r") as f:
+                saved = json.load(f)
+            for state in states:
+                self.assertIn("State." + state.id, saved)
+            FileStorage._FileStorage__commit_delay = 0
+            states[0].name = "Ashanti"
+            states[0].save()
+            storage.flush()
+            with open("file.json", "r") as f:
+                saved = json.load(f)
+            self.assertEqual(saved["State." + states[0].id]["name"],
+                             "Ashanti")
+        finally:
+            FileStorage._FileStorage__group_commit = False
+            FileStorage._FileStorage__commit_delay = 0.05
+            FileStorage._FileStorage__commit_batch = 100
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_group_commit_errors_follow_tickets(self):
+        """Test that waiters see the outcome of the writes covering them"""
+        storage = FileStorage()
+        FileStorage._FileStorage__group_commit = True
+        FileStorage._FileStorage__commit_delay = 0
+        commits = FileStorage._FileStorage__commits
+        try:
+            with mock.patch.object(FileStorage, "_write",
+                                   side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    storage.save(wait=True)
+            failed = commits["requested"]
+            storage.save(wait=True)
+            written = commits["requested"]
+            with mock.patch.object(FileStorage, "_write",
+                                   side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    storage.save(wait=True)
+            with FileStorage._FileStorage__commit_cond:
+                # rewritten by the later successful write
+                storage._wait_for(failed)
+                storage._wait_for(written)
+        finally:
+            storage.save(wait=True)
+            FileStorage._FileStorage__group_commit = False
+            FileStorage._FileStorage__commit_delay = 0.05
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_concurrent_access(self):
+        """Test that many threads can read and change storage at once"""
+        storage = FileStorage()
+        state = State(name="Eastern")
+        storage.new(state)
+        errors = []
+
+        def write(n):
+            """adds and removes cities of the state"""
+            for i in range(1000):
+                city = City(name="City {} {}".format(n, i),
+                            state_id=state.id)
+                storage.new(city)
+                if i % 2:
+                    storage.delete(city)
+                if i % 500 == 0:
+                    storage.save()
+
+        def read():
+            """lists, pages, counts and looks up the cities"""
+            for i in range(100):
+                for city in storage.all(City).values():
+                    city.to_dict()
+                storage.page(City, 10)
+                storage.count(City)
+                len(state.cities)
+
+        def guard(target, *args):
+            """runs target, collecting its exceptions"""
+            try:
+                target(*args)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=guard, args=(write, n))
+                   for n in range(4)]
+        threads += [threading.Thread(target=guard, args=(read,))
+                    for n in range(4)]
+        count = storage.count(City)
+        interval = sys.getswitchinterval()
+        # switch threads as often as possible to expose races
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        self.assertEqual(storage.count(City), count + 2000)
+        self.assertEqual(len(state.cities), 2000)
+        for city in state.cities:
+            storage.delete(city)
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_shared_mode_merges_other_processes(self):
+        """Test that shared mode keeps the writes of other processes"""
+        storage = FileStorage()
+        mine = State(name="Mine")
+        gone = State(name="Gone")
+        FileStorage._FileStorage__shared = True
+        script = ("from models import storage\n"
+                  "from models.state import State\n"
+                  "storage.delete(storage.get(State, '{}'))\n"
+                  "state = State(name='Theirs')\n"
+                  "state.save()\n"
+                  "print(state.id)\n").format(gone.id)
+        env = dict(os.environ, HBNB_FILE_SHARED="1",
+                   PYTHONPATH=os.getcwd())
+        env.pop("HBNB_TYPE_STORAGE", None)
+        try:
+            storage.new(gone)
+            storage.save()
+            theirs = subprocess.run([sys.executable, "-c", script], env=env,
+                                    check=True, capture_output=True,
+                                    text=True).stdout.strip()
+            storage.new(mine)
+            storage.save()
+            with open("file.json", "r") as f:
+                saved = json.load(f)
+            self.assertIn("State." + mine.id, saved)
+            self.assertIn("State." + theirs, saved)
+            self.assertNotIn("State." + gone.id, saved)
+            self.assertEqual(storage.get(State, theirs).name, "Theirs")
+            self.assertIsNone(storage.get(State, gone.id))
+            subprocess.run([sys.executable, "-c",
+                            "from models import storage\n"
+                            "from models.state import State\n"
+                            "storage.get(State, '{}').delete()\n"
+                            "storage.save()\n".format(theirs)],
+                           env=env, check=True)
+            storage.close()
+            self.assertIsNone(storage.get(State, theirs))
+        finally:
+            FileStorage._FileStorage__shared = False
+            storage.delete(mine)
+            storage.save()
+            if os.path.exists("file.json.lock"):
+                os.remove("file.json.lock")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_shared_mode_concurrent_processes(self):
+        """Test that processes saving at the same time lose no write"""
+        storage = FileStorage()
+        storage.save()
+        script = ("from models.state import State\n"
+                  "for i in range(20):\n"
+                  "    State(name='Worker {}').save()\n")
+        env = dict(os.environ, HBNB_FILE_SHARED="1",
+                   PYTHONPATH=os.getcwd())
+        env.pop("HBNB_TYPE_STORAGE", None)
+        workers = [subprocess.Popen([sys.executable, "-c",
+                                     script.format(n)], env=env)
+                   for n in range(3)]
+        try:
+            for worker in workers:
+                self.assertEqual(worker.wait(), 0)
+            with open("file.json", "r") as f:
+                saved = json.load(f)
+            for n in range(3):
+                names = [obj for obj in saved.values()
+                         if obj.get("name") == "Worker {}".format(n)]
+                self.assertEqual(len(names), 20)
+        finally:
+            storage.close()
+            FileStorage._FileStorage__shared = True
+            for state in list(storage.all(State).values()):
+                if state.name.startswith("Worker "):
+                    storage.delete(state)
+            storage.save()
+            FileStorage._FileStorage__shared = False
+            if os.path.exists("file.json.lock"):
+                os.remove("file.json.lock")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_sharded_mode(self):
+        """Test that sharded mode loads and writes one file per class"""
+        storage = FileStorage()
+        state = State(name="Bono")
+        city = City(name="Sunyani", state_id=state.id)
+        FileStorage._FileStorage__sharded = True
+        try:
+            storage.reload()
+            storage.new(state)
+            storage.new(city)
+            storage.save()
+            for name in classes:
+                self.assertTrue(os.path.exists(name + ".json"))
+            with open("City.json", "r") as f:
+                self.assertIn("City." + city.id, json.load(f))
+            before = os.stat("City.json")
+            state.name = "Bono East"
+            storage.new(state)
+            storage.save()
+            after = os.stat("City.json")
+            self.assertEqual((before.st_ino, before.st_mtime_ns),
+                             (after.st_ino, after.st_mtime_ns))
+            with open("State.json", "r") as f:
+                self.assertEqual(json.load(f)["State." + state.id]["name"],
+                                 "Bono East")
+            storage.reload()
+            loaded = FileStorage._FileStorage__loaded
+            self.assertEqual(loaded, set())
+            self.assertEqual(storage.get(State, state.id).name, "Bono East")
+            self.assertEqual(loaded, {"State"})
+            self.assertEqual([c.id for c in state.cities], [city.id])
+            self.assertEqual(loaded, {"State", "City"})
+        finally:
+            FileStorage._FileStorage__sharded = False
+            storage.delete(state)
+            storage.delete(city)
+            storage.save()
+            for name in classes:
+                if os.path.exists(name + ".json"):
+                    os.remove(name + ".json")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_ndjson_reload_bounded_memory(self):
+        """Test that reloading NDJSON does not hold the whole file"""
+        storage = FileStorage()
+        reviews = [Review(place_id="p", user_id="u", text="x" * 200)
+                   for i in range(2000)]
+        for review in reviews:
+            storage.new(review)
+        storage.save()
+        overhead = {}
+        try:
+            for serializer in (JSONSerializer, NDJSONSerializer):
+                FileStorage._FileStorage__format = serializer
+                FileStorage._FileStorage__file_path = \
+                    "file" + serializer.extension
+                storage.compact()
+                tracemalloc.start()
+                storage._sync()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                overhead[serializer] = peak - current
+            self.assertEqual(storage.count(Review), len(reviews))
+            size = os.path.getsize("file.ndjson")
+            self.assertLess(overhead[NDJSONSerializer], size / 10)
+            self.assertGreater(overhead[JSONSerializer], size)
+        finally:
+            FileStorage._FileStorage__format = JSONSerializer
+            FileStorage._FileStorage__file_path = "file.json"
+            if os.path.exists("file.ndjson"):
+                os.remove("file.ndjson")
+            for review in reviews:
+                storage.delete(review)
+            storage.save()
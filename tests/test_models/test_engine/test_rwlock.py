@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Contains the TestReadWriteLock classes
+"""
+
+import inspect
+from models.engine import rwlock
+import pep8
+import threading
+import unittest
+ReadWriteLock = rwlock.ReadWriteLock
+
+
+class TestReadWriteLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ReadWriteLock"""
+
+    def test_pep8_conformance(self):
+        """Test that rwlock.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'models/engine/rwlock.py',
+            'tests/test_models/test_engine/test_rwlock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_docstrings(self):
+        """Test for the module, class and method docstrings"""
+        self.assertTrue(len(rwlock.__doc__) >= 1)
+        self.assertTrue(len(ReadWriteLock.__doc__) >= 1)
+        for func in inspect.getmembers(ReadWriteLock, inspect.isfunction):
+            with self.subTest(function=func):
+                self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test the ReadWriteLock class"""
+
+    def in_thread(self, target):
+        """runs target in another thread, returns whether it finished"""
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(0.2)
+        return not thread.is_alive()
+
+    def test_readers_share(self):
+        """Test that several threads can read at once"""
+        lock = ReadWriteLock()
+        with lock.read():
+            self.assertTrue(self.in_thread(lambda: lock.read().__enter__()))
+
+    def test_writer_excludes(self):
+        """Test that a writer excludes readers and other writers"""
+        lock = ReadWriteLock()
+        with lock.write():
+            self.assertFalse(self.in_thread(lock.acquire_read))
+        lock = ReadWriteLock()
+        with lock.read():
+            self.assertFalse(self.in_thread(lock.acquire_write))
+
+    def test_waiting_writer_blocks_new_readers(self):
+        """Test that readers queue behind a waiting writer"""
+        lock = ReadWriteLock()
+        with lock.read():
+            self.assertFalse(self.in_thread(lock.acquire_write))
+            self.assertFalse(self.in_thread(lock.acquire_read))
+
+    def test_reentrant(self):
+        """Test that both sides are reentrant and writers may read"""
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+        self.assertTrue(self.in_thread(lock.acquire_write))
+
+    def test_no_upgrade(self):
+        """Test that a reader cannot upgrade to writing"""
+        lock = ReadWriteLock()
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
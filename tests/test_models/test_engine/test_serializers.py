@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializers classes
+"""
+
+import inspect
+import json
+import os
+import pep8
+from models.engine import serializers
+from models.city import City
+from models.state import State
+import unittest
+
+
+class TestSerializersDocs(unittest.TestCase):
+    """Tests to check the documentation and style of serializers.py"""
+
+    def test_pep8_conformance(self):
+        """Test that serializers.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'models/engine/serializers.py',
+            'tests/test_models/test_engine/test_serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_module_docstring(self):
+        """Test for the serializers.py module docstring"""
+        self.assertTrue(len(serializers.__doc__) >= 1,
+                        "serializers.py needs a docstring")
+
+    def test_func_docstrings(self):
+        """Test for the presence of docstrings in the serializers"""
+        funcs = inspect.getmembers(serializers, inspect.isfunction)
+        for cls in set(serializers.serializers.values()):
+            funcs += inspect.getmembers(cls, inspect.isfunction)
+        for func in funcs:
+            with self.subTest(function=func):
+                self.assertTrue(func[1].__doc__ and len(func[1].__doc__) > 1,
+                                "{:s} needs a docstring".format(func[0]))
+
+
+class TestSerializers(unittest.TestCase):
+    """Test the FileStorage serializers"""
+
+    def setUp(self):
+        """Build the records a save would write"""
+        state = State(name="Volta")
+        self.objects = {"State." + state.id: state.to_dict()}
+
+    def tearDown(self):
+        """Remove the files written by the tests"""
+        for path in ("test.json", "test.pickle", "test.ndjson",
+                     "test.snapshot"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_round_trip(self):
+        """Test that every serializer reads back what it wrote"""
+        for name, serializer in serializers.serializers.items():
+            with self.subTest(serializer=name):
+                data = serializer.dumps(self.objects)
+                self.assertIs(type(data), bytes)
+                self.assertEqual(serializer.loads(data), self.objects)
+
+    def test_json_formats_are_compatible(self):
+        """Test that json and orjson files read with the json module"""
+        for name in ("json", "orjson"):
+            with self.subTest(serializer=name):
+                data = serializers.serializers[name].dumps(self.objects)
+                self.assertEqual(json.loads(data), self.objects)
+
+    def test_convert(self):
+        """Test that convert copies a file to the format of its extension"""
+        with open("test.json", "w") as f:
+            json.dump(self.objects, f)
+        self.assertEqual(serializers.convert("test.json", "test.pickle"), 1)
+        os.remove("test.json")
+        serializers.convert("test.pickle", "test.json")
+        with open("test.json", "r") as f:
+            self.assertEqual(json.load(f), self.objects)
+        with open("test.pickle", "rb") as f:
+            self.assertEqual(serializers.PickleSerializer.loads(f.read()),
+                             self.objects)
+
+    def test_ndjson_streams_records(self):
+        """Test that NDJSON writes and reads one record per line"""
+        serializer = serializers.NDJSONSerializer
+        with open("test.ndjson", "wb") as f:
+            serializer.dump(iter(self.objects.items()), f)
+        with open("test.ndjson", "rb") as f:
+            self.assertEqual(len(f.readlines()), len(self.objects))
+        with open("test.ndjson", "rb") as f:
+            records = serializer.load(f)
+            self.assertEqual(next(records), next(iter(self.objects.items())))
+        serializers.convert("test.ndjson", "test.json")
+        with open("test.json", "r") as f:
+            self.assertEqual(json.load(f), self.objects)
+
+    def test_snapshot_reads_records_on_demand(self):
+        """Test that a mapped snapshot finds records by key"""
+        city = City(state_id="s", name="Ho")
+        self.objects["City." + city.id] = city.to_dict()
+        with open("test.snapshot", "wb") as f:
+            serializers.SnapshotSerializer.dump(self.objects.items(), f)
+        snapshot = serializers.Snapshot("test.snapshot")
+        keys = sorted(self.objects)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual([snapshot.key(i) for i in range(2)], keys)
+        self.assertEqual(snapshot.record(1), (keys[1], self.objects[keys[1]]))
+        self.assertEqual(snapshot.get("City." + city.id),
+                         self.objects["City." + city.id])
+        self.assertIsNone(snapshot.get("City.missing"))
+        self.assertEqual(snapshot.range("State."), (1, 2))
+        self.assertEqual(snapshot.range("Place."), (1, 1))
+        with open("test.snapshot", "rb") as f:
+            self.assertEqual(dict(serializers.by_extension(
+                "test.snapshot").load(f)), self.objects)
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotStorage classes
+"""
+
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine import snapshot_storage
+from models.engine.serializers import Snapshot, SnapshotSerializer
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import unittest
+SnapshotStorage = snapshot_storage.SnapshotStorage
+
+
+class TestSnapshotStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SnapshotStorage"""
+
+    def test_pep8_conformance(self):
+        """Test that snapshot_storage.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'models/engine/snapshot_storage.py',
+            'tests/test_models/test_engine/test_snapshot_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_docstrings(self):
+        """Test for the module, class and method docstrings"""
+        self.assertTrue(len(snapshot_storage.__doc__) >= 1)
+        self.assertTrue(len(SnapshotStorage.__doc__) >= 1)
+        for func in inspect.getmembers(SnapshotStorage, inspect.isfunction):
+            with self.subTest(function=func):
+                self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestSnapshotStorage(unittest.TestCase):
+    """Test the SnapshotStorage class"""
+
+    path = "test.snapshot"
+
+    def setUp(self):
+        """Write a snapshot of two states, a city and two places"""
+        self.saved = SnapshotStorage._SnapshotStorage__file_path
+        SnapshotStorage._SnapshotStorage__file_path = self.path
+        self.amenity = Amenity(name="Wifi")
+        self.states = [State(name="Volta"), State(name="Ashanti")]
+        self.city = City(state_id=self.states[0].id, name="Ho")
+        self.places = [Place(city_id=self.city.id, name="Hut",
+                             amenity_ids=[self.amenity.id]),
+                       Place(city_id="elsewhere", name="Tent")]
+        self.write(self.states + [self.city, self.amenity] + self.places)
+        self.storage = SnapshotStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        """Restore the snapshot path and remove the file"""
+        SnapshotStorage._SnapshotStorage__file_path = self.saved
+        SnapshotStorage._SnapshotStorage__snapshot = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, objs):
+        """writes objs to the snapshot file"""
+        with open(self.path, 'wb') as f:
+            SnapshotSerializer.dump(
+                ((obj.__class__.__name__ + "." + obj.id, obj.to_dict())
+                 for obj in objs), f)
+
+    def test_get(self):
+        """Test that get decodes the record of a class and id"""
+        state = self.storage.get(State, self.states[1].id)
+        self.assertIsInstance(state, State)
+        self.assertEqual(state.to_dict(), self.states[1].to_dict())
+        self.assertEqual(self.storage.get("State", self.states[0].id).name,
+                         "Volta")
+        self.assertIsNone(self.storage.get(City, self.states[0].id))
+        self.assertIsNone(self.storage.get(State, "missing"))
+        found = self.storage.get_many("State", [self.states[0].id, "x"])
+        self.assertEqual(list(found), [self.states[0].id])
+
+    def test_all_and_count(self):
+        """Test that all and count cover the whole file or one class"""
+        self.assertEqual(len(self.storage.all()), 6)
+        states = self.storage.all(State)
+        self.assertEqual(sorted(states),
+                         sorted("State." + s.id for s in self.states))
+        self.assertEqual(self.storage.count(), 6)
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.count("Review"), 0)
+        self.assertEqual(self.storage.counts()["Place"], 2)
+
+    def test_page(self):
+        """Test that pages follow the id order of a class"""
+        ids = sorted(s.id for s in self.states)
+        first = self.storage.page(State, limit=1)
+        self.assertEqual([s.id for s in first], ids[:1])
+        rest = self.storage.page(State, limit=1, after=first[0].id)
+        self.assertEqual([s.id for s in rest], ids[1:])
+        self.assertEqual(self.storage.page(State, after=ids[1]), [])
+        self.assertEqual([s.id for s in self.storage.iterate(State, batch=1)],
+                         ids)
+
+    def test_lookup_and_search(self):
+        """Test the foreign key and list attribute lookups"""
+        cities = self.storage.lookup(City, "state_id", self.states[0].id)
+        self.assertEqual([c.id for c in cities], [self.city.id])
+        places = self.storage.lookup(Place, "amenity_ids", self.amenity.id)
+        self.assertEqual([p.id for p in places], [self.places[0].id])
+        found = self.storage.search_places(states=[self.states[0].id])
+        self.assertEqual([p.id for p in found], [self.places[0].id])
+        self.assertEqual(len(self.storage.search_places()), 2)
+        found = self.storage.search_places(amenities=[self.amenity.id])
+        self.assertEqual([p.id for p in found], [self.places[0].id])
+
+    def test_read_only(self):
+        """Test that changing the snapshot raises PermissionError"""
+        with self.assertRaises(PermissionError):
+            self.storage.new(State(name="Oti"))
+        with self.assertRaises(PermissionError):
+            self.storage.save()
+        with self.assertRaises(PermissionError):
+            self.storage.delete(self.states[0])
+
+    def test_close_remaps_replaced_file(self):
+        """Test that close maps the file again only once it is replaced"""
+        self.storage.close()
+        self.assertEqual(self.storage.count(), 6)
+        skipped = self.storage.reload_stats()["skipped"]
+        self.assertGreater(skipped, 0)
+        state = State(name="Oti")
+        self.write([state])
+        os.utime(self.path, ns=(0, 0))
+        self.storage.close()
+        self.assertEqual(self.storage.count(), 1)
+        self.assertEqual(self.storage.get(State, state.id).name, "Oti")
+
+    def test_missing_file(self):
+        """Test that a missing snapshot reads as an empty store"""
+        os.remove(self.path)
+        self.storage.reload()
+        self.assertEqual(self.storage.all(), {})
+        self.assertEqual(self.storage.count(), 0)
+        self.assertIsNone(self.storage.get(State, self.states[0].id))
+        self.assertEqual(self.storage.page(State), [])